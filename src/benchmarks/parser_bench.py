@@ -0,0 +1,229 @@
+"""Parser benchmark over recorded retailer search pages.
+
+Feeds saved search-result pages through each scraper's ``extract_result``,
+the same call the parsing workers make (no browser, no network), and reports
+per-retailer latency percentiles, pages/sec and peak memory.
+
+Fixtures live in ``benchmarks/fixtures/<retailer>/*.html`` (or ``.html.gz``),
+named after the product searched for. A small synthetic set is committed so
+the benchmark runs out of the box; real pages can be captured from the page
+cache after a normal run:
+
+    python -m benchmarks.parser_bench --capture
+    python -m benchmarks.parser_bench --save-baseline benchmarks/baseline.json
+    python -m benchmarks.parser_bench --baseline benchmarks/baseline.json
+"""
+import argparse
+import contextlib
+import gzip
+import io
+import json
+import os
+import re
+import statistics
+import sys
+import tracemalloc
+from typing import Dict, List
+
+from config.settings import WEBSITES, PAGE_CACHE_DIR
+from utils.metrics import METRICS
+from utils.page_cache import PageCache
+from main import DEFAULT_PRODUCTS, SCRAPER_CLASSES
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# DOM parsing, candidate matching (structured data included) and the whole extract_result call
+STAGES = ['parse', 'match', 'total']
+
+
+def fixture_name(product: Dict) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', product['name'].lower()).strip('-')
+
+
+def load_fixtures(fixtures_dir: str, retailer: str) -> List[Dict]:
+    """Load the recorded pages for a retailer"""
+    retailer_dir = os.path.join(fixtures_dir, retailer)
+    if not os.path.isdir(retailer_dir):
+        return []
+
+    fixtures = []
+    for name in sorted(os.listdir(retailer_dir)):
+        path = os.path.join(retailer_dir, name)
+        if name.endswith('.html.gz'):
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                content = f.read()
+        elif name.endswith('.html'):
+            with open(path, encoding='utf-8') as f:
+                content = f.read()
+        else:
+            continue
+        fixtures.append({'name': name.split('.')[0], 'content': content})
+    return fixtures
+
+
+def percentile(samples: List[float], pct: int) -> float:
+    if len(samples) < 2:
+        return samples[0] if samples else 0.0
+    return statistics.quantiles(samples, n=100, method='inclusive')[pct - 1]
+
+
+def extract(scraper, product: Dict, content: str):
+    try:
+        return scraper.extract_result(product, content)
+    except Exception:
+        # A parse miss still cost its parse; measure it like any other page
+        return None
+
+
+def bench_retailer(scraper, fixtures: List[Dict], iterations: int) -> Dict:
+    """Time extract_result on each page, split into DOM parsing and matching.
+
+    Peak memory comes from a separate, untimed pass: tracemalloc slows
+    parsing down several times over.
+    """
+    products = {fixture_name(product): product for product in DEFAULT_PRODUCTS}
+    timings = {stage: [] for stage in STAGES}
+    pages = matched = 0
+
+    # The scrapers print as they go; keep that out of the timings and the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(iterations):
+            for fixture in fixtures:
+                product = products.get(fixture['name'], {'name': fixture['name']})
+                with METRICS.recording() as samples:
+                    result = extract(scraper, product, fixture['content'])
+                stages = {stage: seconds for stage, _, seconds in samples}
+                parse = stages.get('parse', 0.0)
+                total = stages.get('extract', 0.0)
+                timings['parse'].append(parse)
+                timings['match'].append(total - parse)
+                timings['total'].append(total)
+                pages += 1
+                matched += bool(result and result.get('Status') == 'ok')
+
+        tracemalloc.start()
+        for fixture in fixtures:
+            extract(scraper, products.get(fixture['name'], {'name': fixture['name']}), fixture['content'])
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    report = {
+        'pages': pages,
+        'matched': matched,
+        'pages_per_sec': pages / sum(timings['total']) if pages else 0.0,
+        'peak_memory_mb': peak / (1024 * 1024),
+    }
+    for stage in STAGES:
+        samples = timings[stage]
+        report[stage] = {
+            'p50_ms': percentile(samples, 50) * 1000,
+            'p90_ms': percentile(samples, 90) * 1000,
+            'p99_ms': percentile(samples, 99) * 1000,
+        }
+    return report
+
+
+def print_report(results: Dict):
+    print(f"{'Retailer':<12} {'Pages':>6} {'Matched':>8} {'Pages/s':>9} {'Peak MB':>8}  "
+          + "  ".join(f"{stage + ' p50/p90/p99 ms':>30}" for stage in STAGES))
+    for retailer, report in results.items():
+        stages = "  ".join(
+            f"{report[stage]['p50_ms']:>10.2f}{report[stage]['p90_ms']:>10.2f}{report[stage]['p99_ms']:>10.2f}"
+            for stage in STAGES
+        )
+        print(f"{retailer:<12} {report['pages']:>6} {report.get('matched', 0):>8} {report['pages_per_sec']:>9.1f} "
+              f"{report['peak_memory_mb']:>8.1f}  {stages}")
+
+
+def compare_to_baseline(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Return a description of every retailer whose p50 or memory regressed past the threshold"""
+    regressions = []
+    for retailer, report in results.items():
+        previous = baseline.get(retailer)
+        if not previous:
+            continue
+        for stage in STAGES:
+            if stage not in previous:
+                continue
+            before = previous[stage]['p50_ms']
+            after = report[stage]['p50_ms']
+            if before > 0 and after > before * (1 + threshold):
+                regressions.append(f"{retailer} {stage} p50: {before:.2f}ms -> {after:.2f}ms")
+        before = previous['peak_memory_mb']
+        after = report['peak_memory_mb']
+        if before > 0 and after > before * (1 + threshold):
+            regressions.append(f"{retailer} peak memory: {before:.1f}MB -> {after:.1f}MB")
+    return regressions
+
+
+def capture_fixtures(fixtures_dir: str, products: List[Dict]):
+    """Copy cached search pages for the given products into the fixtures directory"""
+    cache = PageCache(PAGE_CACHE_DIR, replay=True)
+    captured = 0
+    for retailer, scraper_class in SCRAPER_CLASSES.items():
+        scraper = scraper_class(WEBSITES[retailer])
+        for product in products:
+            content = cache.get(retailer, scraper.build_search_url(product))
+            if content is None:
+                continue
+            retailer_dir = os.path.join(fixtures_dir, retailer)
+            os.makedirs(retailer_dir, exist_ok=True)
+            with gzip.open(os.path.join(retailer_dir, f"{fixture_name(product)}.html.gz"), 'wt', encoding='utf-8') as f:
+                f.write(content)
+            captured += 1
+    print(f"Captured {captured} pages into {fixtures_dir}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scraper parsing over recorded pages")
+    parser.add_argument('--fixtures', default=FIXTURES_DIR, help="Directory of recorded pages")
+    parser.add_argument('--retailer', action='append', choices=sorted(SCRAPER_CLASSES),
+                        help="Only benchmark these retailers")
+    parser.add_argument('--iterations', type=int, default=5, help="Passes over each retailer's pages")
+    parser.add_argument('--baseline', help="Compare against a stored baseline JSON file")
+    parser.add_argument('--save-baseline', help="Write this run's results as a baseline JSON file")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="Allowed slowdown versus the baseline before failing (0.2 = 20%%)")
+    parser.add_argument('--capture', action='store_true',
+                        help="Populate the fixtures from the page cache instead of benchmarking")
+    args = parser.parse_args()
+
+    if args.capture:
+        capture_fixtures(args.fixtures, DEFAULT_PRODUCTS)
+        return 0
+
+    results = {}
+    for retailer in args.retailer or SCRAPER_CLASSES:
+        fixtures = load_fixtures(args.fixtures, retailer)
+        if not fixtures:
+            print(f"No fixtures for {retailer}, skipping")
+            continue
+        scraper = SCRAPER_CLASSES[retailer](WEBSITES[retailer])
+        results[retailer] = bench_retailer(scraper, fixtures, args.iterations)
+
+    if not results:
+        print(f"No fixtures found in {args.fixtures}")
+        return 1
+
+    print_report(results)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.threshold)
+        if regressions:
+            print("Parser regressions against baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
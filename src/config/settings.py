@@ -27,6 +27,206 @@ DEFAULT_HEADERS = {
 # Timeouts
 REQUEST_TIMEOUT = 30
 SELENIUM_TIMEOUT = 20
+PAGE_LOAD_TIMEOUT = 30
+
+# Time budgets (seconds, 0 for none): one search attempt, a product's searches
+# at every retailer including retries (counted from when the first of them
+# leaves its retailer's queue), and the whole run. Searches still queued or
+# running when a budget runs out are cancelled and reported as timed out.
+SEARCH_TIMEOUT = float(os.getenv('SEARCH_TIMEOUT', 60))
+PRODUCT_TIMEOUT = float(os.getenv('PRODUCT_TIMEOUT', 180))
+RUN_TIMEOUT = float(os.getenv('RUN_TIMEOUT', 0))
+
+# Maximum wait (in seconds) for a retailer's results container to appear
+READY_TIMEOUTS = {
+    'amazon': 10,
+    'bestbuy': 15,
+    'costco': 20,
+    'londondrugs': 15,
+    'samsung': 20,
+    'staples': 15,
+    'visions': 15,
+}
+
+# HTML parser backend: 'html.parser', 'lxml' or 'selectolax' (selectolax
+# pre-slices the result cards out of the page, then lxml parses the fragment)
+HTML_PARSER = os.getenv('HTML_PARSER', 'lxml')
+
+# Worker processes for HTML parsing/extraction (0 parses on the event loop thread)
+PARSE_WORKERS = int(os.getenv('PARSE_WORKERS', os.cpu_count() or 1))
+
+# HTTP fetch tier
+HTTP_CONNECTIONS_PER_HOST = int(os.getenv('HTTP_CONNECTIONS_PER_HOST', 4))
+
+# How each retailer is fetched: 'http_first' tries a plain HTTP request and
+# escalates to Selenium only when the page needs JS rendering; 'selenium'
+# always uses a browser. Retailers not listed default to 'selenium'.
+FETCH_MODES = {
+    'amazon': 'http_first',
+    'bestbuy': 'http_first',
+    'londondrugs': 'http_first',
+}
+
+# On-disk page cache
+PAGE_CACHE_ENABLED = os.getenv('PAGE_CACHE_ENABLED', '1') == '1'
+PAGE_CACHE_DIR = os.getenv('PAGE_CACHE_DIR', '.cache/pages')
+PAGE_CACHE_TTL = int(os.getenv('PAGE_CACHE_TTL', 3600))  # seconds
+PAGE_CACHE_MAX_MB = int(os.getenv('PAGE_CACHE_MAX_MB', 500))
 
 # Rate limiting (in seconds)
-REQUEST_DELAY = 6 
\ No newline at end of file
+REQUEST_DELAY = 6
+
+# Per-retailer request pacing (requests/second), keyed like WEBSITES. Each
+# retailer's limiter backs off towards min_rate when it sees captchas, HTTP
+# 429/503 or empty result pages and recovers towards max_rate otherwise.
+RATE_LIMITS = {
+    'default': {'rate': 0.5, 'burst': 3, 'min_rate': 1 / REQUEST_DELAY, 'max_rate': 2.0},
+    'amazon': {'rate': 1.0, 'burst': 3, 'min_rate': 1 / REQUEST_DELAY, 'max_rate': 3.0},
+    'costco': {'rate': 1 / REQUEST_DELAY, 'burst': 1, 'min_rate': 1 / 30, 'max_rate': 0.5},
+}
+
+# WebDriver pool (per retailer)
+DRIVER_POOL_MIN_SIZE = int(os.getenv('DRIVER_POOL_MIN_SIZE', 1))
+DRIVER_POOL_MAX_SIZE = int(os.getenv('DRIVER_POOL_MAX_SIZE', 3))
+DRIVER_RECYCLE_AFTER = int(os.getenv('DRIVER_RECYCLE_AFTER', 50))  # pages served before a driver is restarted
+
+# Crawl scheduling
+MAX_BROWSER_PAGES = int(os.getenv('MAX_BROWSER_PAGES', 8))  # live browser pages across all retailers
+# Threads for blocking browser calls (driver starts, page loads, health checks, quits);
+# 0 gives one per driver pool slot across all retailers
+BROWSER_THREADS = int(os.getenv('BROWSER_THREADS', 0))
+MAX_PRODUCTS_IN_FLIGHT = int(os.getenv('MAX_PRODUCTS_IN_FLIGHT', 100))
+# Concurrent searches per retailer, keyed like WEBSITES
+RETAILER_CONCURRENCY = {
+    'default': DRIVER_POOL_MAX_SIZE,
+    'costco': 1,
+}
+
+# Streaming NDJSON output
+NDJSON_FLUSH_EVERY = int(os.getenv('NDJSON_FLUSH_EVERY', 20))  # records
+NDJSON_FLUSH_INTERVAL = float(os.getenv('NDJSON_FLUSH_INTERVAL', 5))  # seconds
+
+# SQLite price history, written alongside the JSON results
+PRICE_HISTORY_ENABLED = os.getenv('PRICE_HISTORY_ENABLED', '1') == '1'
+PRICE_HISTORY_DB = os.getenv('PRICE_HISTORY_DB', 'price_history.db')
+PRICE_HISTORY_BATCH = int(os.getenv('PRICE_HISTORY_BATCH', 50))  # rows per transaction
+
+# Result selection: cards considered per search page, and the minimum title
+# similarity accepted when no card carries the query's model number
+MAX_CANDIDATES = int(os.getenv('MAX_CANDIDATES', 10))
+MIN_MATCH_SCORE = float(os.getenv('MIN_MATCH_SCORE', 0.2))
+
+# Batched catalog matching (--match): hashed feature dimensions, listings
+# scored per matrix product, and the minimum cosine score kept
+MATCH_FEATURES = int(os.getenv('MATCH_FEATURES', 4096))
+MATCH_BATCH_SIZE = int(os.getenv('MATCH_BATCH_SIZE', 1024))
+MATCH_MIN_SCORE = float(os.getenv('MATCH_MIN_SCORE', 0.5))
+
+# Change detection: skip parsing and storing results whose cards haven't
+# changed since the last run
+CHANGE_DETECTION_ENABLED = os.getenv('CHANGE_DETECTION_ENABLED', '1') == '1'
+FINGERPRINT_DB = os.getenv('FINGERPRINT_DB', '.cache/fingerprints.db')
+
+# Metrics: Prometheus text file written at the end of a run, and an optional
+# /metrics endpoint served while it runs (0 disables it)
+METRICS_FILE = os.getenv('METRICS_FILE', 'metrics.prom')
+METRICS_PORT = int(os.getenv('METRICS_PORT', 0))
+
+# Browser resource blocking: requests a search results page doesn't need.
+# Resource types map to file extensions so Chrome can block them through the
+# DevTools protocol (Network.setBlockedURLs); Firefox gets equivalent prefs.
+RESOURCE_BLOCKING_ENABLED = os.getenv('RESOURCE_BLOCKING_ENABLED', '1') == '1'
+BLOCKED_RESOURCE_TYPES = {
+    'image': ['png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'svg', 'ico'],
+    'font': ['woff', 'woff2', 'ttf', 'otf', 'eot'],
+    'stylesheet': ['css'],
+    'media': ['mp4', 'webm', 'm3u8', 'mp3', 'mov'],
+}
+TRACKER_URL_PATTERNS = [
+    '*google-analytics.com*',
+    '*googletagmanager.com*',
+    '*doubleclick.net*',
+    '*googlesyndication.com*',
+    '*amazon-adsystem.com*',
+    '*facebook.net*',
+    '*connect.facebook.com*',
+    '*hotjar.com*',
+    '*criteo.com*',
+    '*criteo.net*',
+    '*adsrvr.org*',
+    '*scorecardresearch.com*',
+    '*quantserve.com*',
+    '*bat.bing.com*',
+    '*analytics.tiktok.com*',
+    '*youtube.com/embed*',
+]
+RESOURCE_BLOCKING = {
+    'default': {
+        'resource_types': ['image', 'font', 'stylesheet', 'media'],
+        'url_patterns': TRACKER_URL_PATTERNS,
+    },
+    # The consent dialog's visibility checks need its stylesheet
+    'samsung': {
+        'resource_types': ['image', 'font', 'media'],
+        'url_patterns': TRACKER_URL_PATTERNS,
+    },
+}
+
+# Shared-browser mode: a few Chrome processes serve every retailer through
+# tabs instead of each retailer's pool starting its own browsers
+SHARED_BROWSER_ENABLED = os.getenv('SHARED_BROWSER_ENABLED', '0') == '1'
+SHARED_BROWSER_PROCESSES = int(os.getenv('SHARED_BROWSER_PROCESSES', 1))
+BROWSER_PROFILE_DIR = os.getenv('BROWSER_PROFILE_DIR', '.cache/browser-profile')
+
+# Per-retailer sessions: cookie jars shared by a retailer's drivers and HTTP
+# client and kept between runs, rotated by age, pages served, or challenges
+SESSIONS_ENABLED = os.getenv('SESSIONS_ENABLED', '1') == '1'
+SESSION_DIR = os.getenv('SESSION_DIR', '.cache/sessions')
+SESSION_POLICIES = {
+    'default': {
+        'max_age': int(os.getenv('SESSION_MAX_AGE', 6 * 3600)),  # seconds
+        'max_pages': int(os.getenv('SESSION_MAX_PAGES', 500)),
+        'max_challenges': int(os.getenv('SESSION_MAX_CHALLENGES', 1)),  # captchas / 429s before rotating
+    },
+    'amazon': {'max_age': 3600, 'max_pages': 200, 'max_challenges': 1},
+}
+
+# Per-retailer circuit breakers: after this many consecutive errors (or
+# result pages without any cards) a retailer's searches are skipped, with a probe
+# search after the cool-down (seconds, doubled after each failed probe)
+CIRCUIT_BREAKER_ENABLED = os.getenv('CIRCUIT_BREAKER_ENABLED', '1') == '1'
+CIRCUIT_BREAKERS = {
+    'default': {
+        'failure_threshold': int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', 5)),
+        'empty_threshold': int(os.getenv('CIRCUIT_EMPTY_THRESHOLD', 10)),
+        'cool_down': float(os.getenv('CIRCUIT_COOL_DOWN', 60)),
+        'max_cool_down': float(os.getenv('CIRCUIT_MAX_COOL_DOWN', 600)),
+    },
+}
+
+# Retries: attempts per (product, retailer) search, first one included, and
+# the jittered exponential backoff between them (seconds). Only these failure
+# kinds are retried; a search that finds no match is never retried.
+RETRYABLE_FAILURES = os.getenv(
+    'RETRYABLE_FAILURES', 'timeout,driver_crash,bot_wall,parse_miss,fetch_error'
+).split(',')
+RETRY_MAX_ATTEMPTS = int(os.getenv('RETRY_MAX_ATTEMPTS', 3))
+RETRY_BASE_DELAY = float(os.getenv('RETRY_BASE_DELAY', 1.0))
+RETRY_MAX_DELAY = float(os.getenv('RETRY_MAX_DELAY', 20.0))
+# How many times longer retailers that throttle hard back off than the defaults above
+RETRY_SLOW_BACKOFF = float(os.getenv('RETRY_SLOW_BACKOFF', 3.0))
+RETRY_POLICIES = {
+    'default': {
+        'max_attempts': RETRY_MAX_ATTEMPTS,
+        'base_delay': RETRY_BASE_DELAY,
+        'max_delay': RETRY_MAX_DELAY,
+        'retry_on': RETRYABLE_FAILURES,
+    },
+    # Costco throttles hard; retrying a bot wall there only digs deeper
+    'costco': {
+        'max_attempts': RETRY_MAX_ATTEMPTS,
+        'base_delay': RETRY_BASE_DELAY * RETRY_SLOW_BACKOFF,
+        'max_delay': RETRY_MAX_DELAY * RETRY_SLOW_BACKOFF,
+        'retry_on': [kind for kind in RETRYABLE_FAILURES if kind != 'bot_wall'],
+    },
+}
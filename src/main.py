@@ -1,8 +1,11 @@
+import argparse
 import asyncio
 import json
-from typing import List, Dict
+import multiprocessing
+import os
+import time
+from typing import List, Dict, Optional
 from datetime import datetime
-from collections import defaultdict
 
 from scrapers.amazon_scraper import AmazonScraper
 from scrapers.bestbuy_scraper import BestBuyScraper
@@ -12,45 +15,215 @@ from scrapers.visions_scraper import VisionsScraper
 from scrapers.londondrugs_scraper import LondonDrugsScraper
 from scrapers.samsung_scraper import SamsungScraper
 
-from config.settings import WEBSITES
+from config.settings import (
+    WEBSITES, PAGE_CACHE_ENABLED, PAGE_CACHE_DIR, PAGE_CACHE_TTL, PAGE_CACHE_MAX_MB,
+    MAX_PRODUCTS_IN_FLIGHT, NDJSON_FLUSH_EVERY, NDJSON_FLUSH_INTERVAL,
+    PRICE_HISTORY_ENABLED, PRICE_HISTORY_DB, PRICE_HISTORY_BATCH, MATCH_MIN_SCORE,
+    CHANGE_DETECTION_ENABLED, FINGERPRINT_DB, METRICS_FILE, METRICS_PORT,
+    SHARED_BROWSER_ENABLED, SHARED_BROWSER_PROCESSES, BROWSER_PROFILE_DIR, RUN_TIMEOUT, PRODUCT_TIMEOUT,
+)
+from scheduler import CrawlScheduler
+from sharding import (
+    SHARD_BY_MODEL, SHARD_BY_RETAILER, partition_products, partition_retailers,
+    shard_output_path, clear_shard_outputs, write_shard_output, merge_shard_outputs,
+)
+from utils.page_cache import PageCache
+from utils.fingerprints import FingerprintStore
+from utils.metrics import METRICS, start_metrics_server
+from utils.helpers import extract_model_number, normalize_model_number
+from utils.results import KNOWN_BRANDS, merge_by_brand
+from utils.result_sink import NdjsonSink, finalize_ndjson
+from utils.price_history import PriceHistoryStore
+from utils.matching import CatalogMatcher
+from scrapers.parse_pool import shutdown_parse_executor
+from scrapers.deadlines import SharedDeadline
+from scrapers.driver_pool import get_browser_executor
+from scrapers.shared_browser import SharedBrowser
+from scrapers.base_scraper import STATUS_TIMED_OUT
+
+# Default product list, used when no input file is given
+DEFAULT_PRODUCTS = [
+    {"name": "Hisense 50\" 4K Smart Google AI Upscaler LED TV - 50A68N"},
+    {"name": "Hisense 55\" 4K Smart Google AI Upscaler LED TV - 55A68N"},
+    {"name": "Samsung 75\" 4K Tizen Smart CUHD TV - UN75DU7100FXZC"},
+    {"name": "LG 50\" UHD 4K Smart LED TV - 50UT7570PUB"},
+    {"name": "Samsung 65\" 4K Tizen Smart QLED TV - QN65Q60DAFXZC"},
+    {"name": "Hisense 32\" HD Smart VIDAA LED TV - 32A4KV"},
+    {"name": "Samsung 43\" 4K Tizen Smart CUHD TV-UN43DU7100FXZC"},
+    {"name": "LG 65\" UHD 4K Smart LED TV - 65UT7570PUB"},
+    {"name": "Samsung 75\" 4K Tizen Smart QLED TV - QN75Q60DAFXZC"},
+    {"name": "Samsung 65\" Neo QLED 4K Tizen Smart TV QN85D - QN65QN85DBFXZC"},
+    {"name": "LG 65\" 4K Smart evo C4 OLED TV - OLED65C4PUA"},
+    {"name": "LG 86\" UHD 4K Smart LED TV - 86UT7590PUA"},
+    {"name": "SONY 75\" X77L 4K HDR LED TV Google TV - KD75X77L"},
+    {"name": "LG 55\" QNED80 4K Smart QLED TV - 55QNED80TUC"},
+    {"name": "Samsung 65\" OLED 4K Tizen Smart TV S90D - QN65S90DAFXZC"},
+    {"name": "Samsung 75\" 4K Tizen Smart QLED TV - QN75Q80DAFXZC"},
+    {"name": "Samsung 65\" 4K Tizen Smart QLED TV - QN65Q80DAFXZC"},
+    {"name": "Samsung 65\" 4K Tizen Smart CUHD TV - UN65DU7100FXZC"},
+    {"name": "Samsung 75\" 4K Tizen Smart CUHD TV - UN75DU8000FXZC"},
+    {"name": "Hisense 50\" 4K Smart Google AI Upscaler LED TV - 50A68N"}
+]
+
+# Scrapers in the order their results are reported, keyed like WEBSITES
+SCRAPER_CLASSES = {
+    'amazon': AmazonScraper,
+    'bestbuy': BestBuyScraper,
+    'costco': CostcoScraper,
+    'staples': StaplesScraper,
+    'visions': VisionsScraper,
+    'londondrugs': LondonDrugsScraper,
+    'samsung': SamsungScraper,
+}
 
 class PriceScraper:
-    def __init__(self):
-        # Initialize scrapers
+    def __init__(self, page_cache: PageCache = None, retailers: Optional[List[str]] = None,
+                 sinks: Optional[List] = None, fingerprints: Optional[FingerprintStore] = None,
+                 shared_browser: Optional[SharedBrowser] = None, run_timeout: float = RUN_TIMEOUT):
+        # Initialize scrapers, optionally only a subset of retailers (sharded runs)
         self.scrapers = [
-            AmazonScraper(WEBSITES['amazon']),
-            BestBuyScraper(WEBSITES['bestbuy']),
-            CostcoScraper(WEBSITES['costco']),
-            StaplesScraper(WEBSITES['staples']),
-            VisionsScraper(WEBSITES['visions']),
-            LondonDrugsScraper(WEBSITES['londondrugs']),
-            SamsungScraper(WEBSITES['samsung']),
+            scraper_class(WEBSITES[key])
+            for key, scraper_class in SCRAPER_CLASSES.items()
+            if retailers is None or key in retailers
         ]
+        # Share one page cache across all scrapers
+        self.page_cache = page_cache
+        for scraper in self.scrapers:
+            scraper.page_cache = page_cache
+        # Share last run's fingerprints so unchanged results skip parsing and storage
+        self.fingerprints = fingerprints
+        for scraper in self.scrapers:
+            scraper.fingerprints = fingerprints
+        # One browser for every retailer's tabs, instead of browsers per retailer
+        self.shared_browser = shared_browser
+        for scraper in self.scrapers:
+            scraper.shared_browser = shared_browser
         # List of known brands for verification
-        self.known_brands = ['Samsung', 'LG', 'Hisense', 'SONY', 'TCL', 'Philips']
+        self.known_brands = list(KNOWN_BRANDS)
+        # Where each (product, retailer) result is streamed as soon as it completes
+        self.sinks = sinks or []
+        # In-flight searches keyed on normalized model number, shared by duplicate queries
+        self._searches: Dict[str, asyncio.Future] = {}
+        self.scheduler: Optional[CrawlScheduler] = None
+        # Seconds the whole run may take (0 for no limit), and the deadline set when it starts
+        self.run_timeout = run_timeout
+        self.run_deadline: Optional[float] = None
+
+    def product_key(self, product: Dict) -> str:
+        """Key identical queries on their normalized model number"""
+        return normalize_model_number(extract_model_number(product['name']))
+
+    def emit(self, index: int, product: Dict, result: Dict):
+        """Write one (product, retailer) result to every result sink"""
+        if not self.sinks:
+            return
+        record = {
+            "Index": index,
+            "Query": product['name'],
+            "QueryBrand": self.extract_brand(product['name']),
+            "Model": self.product_key(product),
+            "Retailer": result.get('Website', '').lower(),
+            "ScrapedAt": datetime.now().isoformat(timespec='seconds'),
+            "Result": result,
+        }
+        for sink in self.sinks:
+            sink.write(record)
+
+    async def process_product(self, product: Dict, index: int = 0) -> Dict:
+        """Process a single product across all scrapers, sharing in-flight searches for the same model"""
+        key = self.product_key(product)
+        task = self._searches.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self.scrape_product(product, index))
+            self._searches[key] = task
+            task.add_done_callback(lambda _: self._searches.pop(key, None))
+            # Shield the shared search so one caller giving up doesn't cancel it for the others
+            results = await asyncio.shield(task)
+        else:
+            print(f"Coalescing '{product['name']}' with the search already running for {key}")
+            results = await asyncio.shield(task)
+            # The search streamed its results for the product that started it; stream ours too
+            for result in results:
+                self.emit(index, product, dict(result))
+
+        return {
+            "Brand": self.extract_brand(product['name']),
+            # Include all results with a title, even if they don't have a price
+            "Product": [dict(result) for result in results if result.get('Title')]
+        }
+
+    async def scrape_product(self, product: Dict, index: int = 0) -> List[Dict]:
+        """Search for a single product across all scrapers, streaming each result as it completes.
+
+        The product gets PRODUCT_TIMEOUT across all retailers, counted from when
+        its first search leaves a queue; searches still queued or running once
+        it (or the run deadline) is spent are given up on as timed out.
+        """
+        budget = SharedDeadline(PRODUCT_TIMEOUT)
+
+        async def search(scraper):
+            # Through the scheduler when one is running
+            if self.scheduler is not None:
+                result = await self.scheduler.submit(scraper, product, budget)
+            else:
+                result = await scraper.search_product(product, budget)
+            if isinstance(result, Dict):
+                self.emit(index, product, result)
+            return result
+
+        tasks = [asyncio.ensure_future(search(scraper)) for scraper in self.scrapers]
+        pending = set(tasks)
+        while pending:
+            time_left = [left for left in (self.run_time_left(), budget.time_left()) if left is not None]
+            timeout = min(time_left) if time_left else None
+            if timeout is not None and timeout <= 0:
+                break
+            # Also wake when the first search starts the product's clock, to learn its deadline
+            waiting = pending if budget.started.done() else pending | {budget.started}
+            done, _ = await asyncio.wait(waiting, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            pending -= done
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
 
-    async def process_product(self, product: Dict) -> Dict:
-        """Process a single product across all scrapers"""
-        brand = self.extract_brand(product['name'])
         results = []
-        
-        # Run all scrapers concurrently for this product
-        tasks = [scraper.search_product(product) for scraper in self.scrapers]
-        scraped_results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        for i, result in enumerate(scraped_results):
+        for i, task in enumerate(tasks):
+            if task in pending:
+                scraper = self.scrapers[i]
+                print(f"{scraper.website} timed out for '{product['name']}'")
+                METRICS.increment('searches', scraper.retailer_key, STATUS_TIMED_OUT)
+                result = scraper.format_result(product, "", None, status=STATUS_TIMED_OUT)
+                self.emit(index, product, result)
+            elif task.cancelled():
+                continue
+            else:
+                result = task.exception() or task.result()
             if isinstance(result, Dict):
-                # Include all results, even if they don't have a price
+                results.append(result)
                 if result.get('Title'):
-                    results.append(result)
                     print(f"Got result from {self.scrapers[i].website}: {result.get('Title')[:30]}...")
             elif isinstance(result, Exception):
                 print(f"Error with {self.scrapers[i].website}: {str(result)}")
 
-        return {
-            "Brand": brand,
-            "Product": results
-        }
+        return results
+
+    def report_health(self):
+        """Print the retailers whose circuit breaker opened during the run"""
+        for scraper in self.scrapers:
+            if scraper.breaker is None or not scraper.breaker.opened:
+                continue
+            health = scraper.breaker.health()
+            print(f"{scraper.website}: circuit opened {health['times_opened']} times, "
+                  f"{health['skipped']} searches skipped, now {health['state']}")
+
+    def run_time_left(self) -> Optional[float]:
+        """Seconds left before the run deadline, or None without one"""
+        if self.run_deadline is None:
+            return None
+        return max(0.0, self.run_deadline - time.monotonic())
 
     def extract_brand(self, product_name: str) -> str:
         """Extract brand from product name"""
@@ -60,104 +233,315 @@ class PriceScraper:
                 return brand
         return "Unknown"
 
-    def extract_brand_from_title(self, title: str) -> str:
-        """Extract the actual brand from a product title"""
-        if not title:
-            return "Unknown"
-            
-        title_lower = title.lower()
-        for brand in self.known_brands:
-            if brand.lower() in title_lower:
-                return brand
-        return "Unknown"
-
     async def process_all_products(self, products: List[Dict]) -> List[Dict]:
-        """Process all products concurrently and merge by brand"""
-        tasks = [self.process_product(product) for product in products]
-        all_results = await asyncio.gather(*tasks)
+        """Process all products through the crawl scheduler and merge by brand"""
+        all_results = await self.scrape_all(products)
+        return merge_by_brand(all_results, self.known_brands)
+
+    async def scrape_all(self, products: List[Dict], collect: bool = True) -> List[Dict]:
+        """Process all products through the crawl scheduler, returning per-product results in input order.
+
+        With ``collect=False`` results are only streamed to the sinks and not
+        kept in memory.
+        """
+        if self.run_timeout:
+            self.run_deadline = time.monotonic() + self.run_timeout
+
+        if self.shared_browser is not None:
+            # Pay the browser's cold start once, before any retailer needs a tab
+            await asyncio.get_event_loop().run_in_executor(get_browser_executor(), self.shared_browser.start)
+
+        self.scheduler = CrawlScheduler(self.scrapers)
+        self.scheduler.start()
+        # Browsers start while the first searches queue up; checkouts wait on the drivers being started
+        warm_ups = [asyncio.ensure_future(scraper.warm_up()) for scraper in self.scrapers]
+
+        all_results: List[Optional[Dict]] = [None] * len(products) if collect else []
+
+        async def process_indexed(index: int, product: Dict):
+            result = await self.process_product(product, index)
+            if collect:
+                all_results[index] = result
+
+        # Keep a bounded window of products in flight; the scheduler's
+        # per-retailer queues keep every retailer busy within it
+        pending = set()
+        completed = 0
+        for index, product in enumerate(products):
+            if len(pending) >= MAX_PRODUCTS_IN_FLIGHT:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                completed += len(done)
+                print(f"Progress: {completed}/{len(products)} products, {self.scheduler.describe()}")
+            pending.add(asyncio.ensure_future(process_indexed(index, product)))
+        if pending:
+            await asyncio.wait(pending)
+
+        await self.scheduler.close()
+        self.scheduler = None
+        self._searches.clear()
+        self.report_health()
         
+        # Never close a pool while drivers are still being added to it
+        await asyncio.gather(*warm_ups, return_exceptions=True)
+
         # Close all scraper sessions
         close_tasks = [scraper.close() for scraper in self.scrapers]
         await asyncio.gather(*close_tasks)
+        if self.shared_browser is not None:
+            await asyncio.get_event_loop().run_in_executor(get_browser_executor(), self.shared_browser.close)
+        shutdown_parse_executor()
         
-        # Merge results by brand
-        brand_results = defaultdict(list)
-        for result in all_results:
-            query_brand = result.get("Brand")
-            
-            for product in result.get("Product", []):
-                product_title = product.get('Title', '')
-                website = product.get('Website', '')
-                
-                # Special case: Force Samsung scraper results to be Samsung brand
-                if website == 'Samsung':
-                    print(f"Assigning Samsung scraped product to Samsung brand: '{product_title[:30]}...'")
-                    brand_results['Samsung'].append(product)
-                    continue
-                    
-                # For other scrapers, verify the brand in the title
-                actual_brand = self.extract_brand_from_title(product_title)
-                
-                # Only add product if its title contains a brand
-                if actual_brand != "Unknown":
-                    # Add to the correct brand category
-                    print(f"Assigning product '{product_title[:30]}...' to brand {actual_brand}")
-                    brand_results[actual_brand].append(product)
-                    
-                elif query_brand and query_brand != "Unknown":
-                    # If we can't detect a brand but have the query brand, use that
-                    print(f"Using query brand {query_brand} for '{product_title[:30]}...'")
-                    brand_results[query_brand].append(product)
-        
-        # Convert to final format
-        final_results = []
-        for brand, products in brand_results.items():
-            if products:  # Only include brands with products
-                final_results.append({
-                    "Brand": brand,
-                    "Products": products
-                })
-        
-        return final_results
+        return all_results
 
-async def main():
-    # Load input products
-    products = [
-        {"name": "Hisense 50\" 4K Smart Google AI Upscaler LED TV - 50A68N"},
-        {"name": "Hisense 55\" 4K Smart Google AI Upscaler LED TV - 55A68N"},
-        {"name": "Samsung 75\" 4K Tizen Smart CUHD TV - UN75DU7100FXZC"},
-        {"name": "LG 50\" UHD 4K Smart LED TV - 50UT7570PUB"},
-        {"name": "Samsung 65\" 4K Tizen Smart QLED TV - QN65Q60DAFXZC"},
-        {"name": "Hisense 32\" HD Smart VIDAA LED TV - 32A4KV"},
-        {"name": "Samsung 43\" 4K Tizen Smart CUHD TV-UN43DU7100FXZC"},
-        {"name": "LG 65\" UHD 4K Smart LED TV - 65UT7570PUB"},
-        {"name": "Samsung 75\" 4K Tizen Smart QLED TV - QN75Q60DAFXZC"},
-        {"name": "Samsung 65\" Neo QLED 4K Tizen Smart TV QN85D - QN65QN85DBFXZC"},
-        {"name": "LG 65\" 4K Smart evo C4 OLED TV - OLED65C4PUA"},
-        {"name": "LG 86\" UHD 4K Smart LED TV - 86UT7590PUA"},
-        {"name": "SONY 75\" X77L 4K HDR LED TV Google TV - KD75X77L"},
-        {"name": "LG 55\" QNED80 4K Smart QLED TV - 55QNED80TUC"},
-        {"name": "Samsung 65\" OLED 4K Tizen Smart TV S90D - QN65S90DAFXZC"},
-        {"name": "Samsung 75\" 4K Tizen Smart QLED TV - QN75Q80DAFXZC"},
-        {"name": "Samsung 65\" 4K Tizen Smart QLED TV - QN65Q80DAFXZC"},
-        {"name": "Samsung 65\" 4K Tizen Smart CUHD TV - UN65DU7100FXZC"},
-        {"name": "Samsung 75\" 4K Tizen Smart CUHD TV - UN75DU8000FXZC"},
-        {"name": "Hisense 50\" 4K Smart Google AI Upscaler LED TV - 50A68N"}
+def build_page_cache(args) -> Optional[PageCache]:
+    if args.replay or (PAGE_CACHE_ENABLED and not args.no_cache):
+        return PageCache(
+            PAGE_CACHE_DIR,
+            ttl=PAGE_CACHE_TTL,
+            max_bytes=PAGE_CACHE_MAX_MB * 1024 * 1024,
+            replay=args.replay,
+        )
+    return None
+
+def build_price_history(args) -> Optional[PriceHistoryStore]:
+    if PRICE_HISTORY_ENABLED and not args.no_history:
+        return PriceHistoryStore(PRICE_HISTORY_DB, batch_size=PRICE_HISTORY_BATCH)
+    return None
+
+def build_shared_browser(profile_dir: str = BROWSER_PROFILE_DIR) -> Optional[SharedBrowser]:
+    if SHARED_BROWSER_ENABLED:
+        return SharedBrowser(SHARED_BROWSER_PROCESSES, profile_dir)
+    return None
+
+def build_fingerprints(args) -> Optional[FingerprintStore]:
+    if CHANGE_DETECTION_ENABLED:
+        return FingerprintStore(FINGERPRINT_DB, compare=not args.full)
+    return None
+
+def load_products(input_file: Optional[str]) -> List[Dict]:
+    """Load products from a JSON list of {"name": ...} objects, or use the default list"""
+    if not input_file:
+        return DEFAULT_PRODUCTS
+    with open(input_file, encoding='utf-8') as f:
+        return json.load(f)
+
+async def run_shard(args, shard_index: int, shard_count: int):
+    """Scrape one shard of the run and write its per-product results to the output directory"""
+    products = load_products(args.input)
+    retailers = None
+    if args.shard_by == SHARD_BY_RETAILER:
+        indexed_products = list(enumerate(products))
+        retailers = partition_retailers(list(SCRAPER_CLASSES), shard_count)[shard_index]
+    else:
+        indexed_products = partition_products(products, shard_count)[shard_index]
+
+    print(f"Shard {shard_index + 1}/{shard_count}: {len(indexed_products)} products, "
+          f"retailers: {', '.join(retailers or SCRAPER_CLASSES)}")
+
+    page_cache = build_page_cache(args)
+    price_history = build_price_history(args)
+    fingerprints = build_fingerprints(args)
+    # Chrome locks its profile directory, so each shard warms its own
+    shared_browser = build_shared_browser(os.path.join(BROWSER_PROFILE_DIR, f"shard-{shard_index:03d}"))
+    scraper = PriceScraper(page_cache=page_cache, retailers=retailers,
+                           sinks=[price_history] if price_history else None, fingerprints=fingerprints,
+                           shared_browser=shared_browser, run_timeout=args.deadline)
+    try:
+        results = await scraper.scrape_all([product for _, product in indexed_products])
+    finally:
+        if price_history is not None:
+            price_history.close()
+        if fingerprints is not None:
+            fingerprints.close()
+
+    indexed_results = [(index, result) for (index, _), result in zip(indexed_products, results) if result]
+    write_shard_output(args.output_dir, shard_index, shard_count, args.shard_by, indexed_results)
+    print(f"Shard {shard_index + 1}/{shard_count} saved to {shard_output_path(args.output_dir, shard_index)}")
+    report_metrics(os.path.join(args.output_dir, f"metrics-{shard_index:03d}.prom"))
+
+def run_shard_process(args, shard_index: int, shard_count: int):
+    """Entry point for a local shard worker process"""
+    asyncio.run(run_shard(args, shard_index, shard_count))
+
+def run_local_shards(args):
+    """Run every shard in its own process on this machine and wait for them"""
+    clear_shard_outputs(args.output_dir)
+    if args.shard_by == SHARD_BY_RETAILER and args.shards > len(SCRAPER_CLASSES):
+        # Extra shards would have no retailer to scrape
+        print(f"Warning: only {len(SCRAPER_CLASSES)} retailers to split, "
+              f"running {len(SCRAPER_CLASSES)} shards instead of {args.shards}")
+        args.shards = len(SCRAPER_CLASSES)
+    # Split the cores between shards rather than giving each shard a full parsing pool
+    os.environ.setdefault('PARSE_WORKERS', str(max(1, (os.cpu_count() or 1) // args.shards)))
+
+    context = multiprocessing.get_context('spawn')
+    processes = [
+        context.Process(target=run_shard_process, args=(args, shard_index, args.shards))
+        for shard_index in range(args.shards)
     ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        if process.exitcode != 0:
+            print(f"Shard process {process.name} exited with code {process.exitcode}")
 
-    scraper = PriceScraper()
-    results = await scraper.process_all_products(products)
-    
-    print(results)
+def report_metrics(metrics_file: str = METRICS_FILE):
+    """Print the per-run summary table and write the Prometheus text file"""
+    print(METRICS.summary_table())
+    if metrics_file:
+        METRICS.write_prometheus(metrics_file)
+        print(f"Metrics saved to {metrics_file}")
 
+def save_results(results: List[Dict], output_file: Optional[str] = None):
     # Save results to file
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_file = f"results_{timestamp}.json"
+    if output_file is None:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_file = f"results_{timestamp}.json"
     
     with open(output_file, 'w', encoding='utf-8') as f:
         json.dump(results, f, indent=2, ensure_ascii=False)
 
     print(f"Results saved to {output_file}")
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare product prices across Canadian retailers")
+    parser.add_argument('--replay', action='store_true',
+                        help="Serve pages only from the page cache, never fetch from retailers")
+    parser.add_argument('--no-cache', action='store_true', help="Disable the on-disk page cache")
+    parser.add_argument('--input', help="JSON file with a list of products ({\"name\": ...})")
+
+    parser.add_argument('--finalize', metavar='NDJSON',
+                        help="Build the brand-grouped JSON from a (possibly partial) results stream and exit")
+    parser.add_argument('--deadline', type=float, default=RUN_TIMEOUT, metavar='SECONDS',
+                        help="Stop searching after this long; unfinished searches are reported as timed out")
+    parser.add_argument('--full', action='store_true',
+                        help="Re-parse every page, even when its results haven't changed since the last run")
+    parser.add_argument('--no-history', action='store_true', help="Don't record prices in the price-history database")
+    parser.add_argument('--history', metavar='MODEL',
+                        help="Print the recorded price history for a model number and exit")
+    parser.add_argument('--retailer', help="Limit --history to one retailer, e.g. bestbuy")
+    parser.add_argument('--since', help="Limit --history to prices scraped on or after this ISO date")
+
+    parser.add_argument('--match', metavar='LISTINGS',
+                        help="Match a CSV/JSON/NDJSON file of listings (with a Title column) against the product list and exit")
+    parser.add_argument('--top-k', type=int, default=1, help="Catalog matches kept per listing with --match")
+
+    sharding = parser.add_argument_group("sharded runs")
+    sharding.add_argument('--shards', type=int, default=0,
+                          help="Split the run across this many local worker processes")
+    sharding.add_argument('--shard-index', type=int,
+                          help="Run only this shard (0-based), e.g. one of several hosts")
+    sharding.add_argument('--shard-count', type=int, help="Total number of shards when using --shard-index")
+    sharding.add_argument('--shard-by', choices=[SHARD_BY_MODEL, SHARD_BY_RETAILER], default=SHARD_BY_MODEL,
+                          help="Partition products by model number hash, or retailers across shards")
+    sharding.add_argument('--output-dir', default='shards', help="Directory shards write their output to")
+    sharding.add_argument('--merge', action='store_true',
+                          help="Only merge the shard outputs in --output-dir into a results file")
+    return parser.parse_args()
+
+async def main(args):
+    # Load input products
+    products = load_products(args.input)
+
+    page_cache = build_page_cache(args)
+
+    # Stream every result to NDJSON as it completes, then build the brand-grouped JSON from the stream
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    sink = NdjsonSink(f"results_{timestamp}.ndjson", flush_every=NDJSON_FLUSH_EVERY,
+                      flush_interval=NDJSON_FLUSH_INTERVAL)
+    print(f"Streaming results to {sink.path}")
+
+    sinks = [sink]
+    price_history = build_price_history(args)
+    if price_history is not None:
+        sinks.append(price_history)
+
+    fingerprints = build_fingerprints(args)
+    metrics_server = await start_metrics_server(METRICS, METRICS_PORT) if METRICS_PORT else None
+    scraper = PriceScraper(page_cache=page_cache, sinks=sinks, fingerprints=fingerprints,
+                           shared_browser=build_shared_browser(), run_timeout=args.deadline)
+    try:
+        await scraper.scrape_all(products, collect=False)
+    finally:
+        for result_sink in sinks:
+            result_sink.close()
+        if fingerprints is not None:
+            fingerprints.close()
+        if metrics_server is not None:
+            await metrics_server.cleanup()
+
+    if fingerprints is not None:
+        print(f"{fingerprints.unchanged} results unchanged since the last run")
+
+    if price_history is not None:
+        print(f"Recorded {price_history.rows_written} prices in {price_history.path}")
+
+    if page_cache is not None:
+        print(f"Page cache: {page_cache.hits} hits, {page_cache.misses} misses")
+
+    with METRICS.timer('merge', 'all'):
+        results = finalize_ndjson(sink.path, list(SCRAPER_CLASSES), scraper.known_brands)
+    print(results)
+
+    save_results(results, f"results_{timestamp}.json")
+    report_metrics()
+
+def print_history(args):
+    store = PriceHistoryStore(PRICE_HISTORY_DB)
+    try:
+        for row in store.history(normalize_model_number(args.history), args.retailer, args.since):
+            print(f"{row['ScrapedAt']}  {row['Retailer']:<12} {row['Price'] if row['Price'] is not None else '-':>10}  "
+                  f"{row['Title'][:60]}")
+    finally:
+        store.close()
+
+def load_listings(path: str):
+    """Load harvested listings from CSV, JSON or NDJSON; result streams are flattened to their results"""
+    import pandas as pd
+
+    if path.endswith('.csv'):
+        listings = pd.read_csv(path)
+    else:
+        listings = pd.read_json(path, lines=path.endswith(('.ndjson', '.jsonl')))
+    if 'Title' not in listings.columns and 'Result' in listings.columns:
+        listings = pd.json_normalize(listings['Result'].tolist())
+    return listings
+
+def match_listings(args):
+    """Match a file of harvested listings against the product list in one pass"""
+    listings = load_listings(args.match)
+    catalog = [product['name'] for product in load_products(args.input)]
+    matches = CatalogMatcher(catalog).match(listings, k=args.top_k, min_score=MATCH_MIN_SCORE)
+    print(f"Matched {matches['ListingIndex'].nunique()} of {len(listings)} listings "
+          f"against {len(catalog)} products")
+
+    output_file = f"matches_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    matches.to_csv(output_file, index=False)
+    print(f"Matches saved to {output_file}")
+
+def run(args):
+    if args.history:
+        print_history(args)
+    elif args.match:
+        match_listings(args)
+    elif args.finalize:
+        save_results(finalize_ndjson(args.finalize, list(SCRAPER_CLASSES)),
+                     os.path.splitext(args.finalize)[0] + '.json')
+    elif args.shard_index is not None:
+        # One shard of a multi-host run; a coordinator merges with --merge
+        if not args.shard_count or not 0 <= args.shard_index < args.shard_count:
+            raise SystemExit("--shard-index needs --shard-count greater than the index")
+        if args.shard_by == SHARD_BY_RETAILER and args.shard_count > len(SCRAPER_CLASSES):
+            raise SystemExit(f"--shard-by retailer needs --shard-count of at most {len(SCRAPER_CLASSES)}, "
+                             "the number of retailers")
+        asyncio.run(run_shard(args, args.shard_index, args.shard_count))
+    elif args.merge or args.shards > 1:
+        if not args.merge:
+            run_local_shards(args)
+        save_results(merge_shard_outputs(args.output_dir, list(SCRAPER_CLASSES)))
+    else:
+        asyncio.run(main(args))
+
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    run(parse_args()) 
\ No newline at end of file
@@ -0,0 +1,119 @@
+import asyncio
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from scrapers.base_scraper import BaseScraper
+from scrapers.deadlines import SharedDeadline
+from config.settings import RETAILER_CONCURRENCY, MAX_BROWSER_PAGES
+
+
+class BrowserBudget:
+    """Global cap on live browser pages, used as ``async with budget:``"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_use = 0
+        self._semaphore = asyncio.Semaphore(limit)
+
+    async def __aenter__(self):
+        await self._semaphore.acquire()
+        self.in_use += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.in_use -= 1
+        self._semaphore.release()
+
+
+class CrawlScheduler:
+    """Work queue of (product, retailer) jobs between PriceScraper and the scrapers.
+
+    Each retailer has its own queue drained by a fixed number of workers, so
+    a slow retailer never holds up the others and the number of searches in
+    flight per retailer is bounded. A global semaphore, shared with the
+    scrapers, caps how many browser pages are live at once across retailers.
+    """
+
+    def __init__(self, scrapers: List[BaseScraper], max_browser_pages: int = MAX_BROWSER_PAGES):
+        self.scrapers = scrapers
+        self.max_browser_pages = max_browser_pages
+        self.browser_slots = BrowserBudget(max_browser_pages)
+        self._queues: Dict[str, asyncio.Queue] = {scraper.retailer_key: asyncio.Queue() for scraper in scrapers}
+        self._in_flight: Dict[str, int] = defaultdict(int)
+        self._completed: Dict[str, int] = defaultdict(int)
+        self._workers: List[asyncio.Task] = []
+        self._stopping = False
+
+        for scraper in scrapers:
+            scraper.browser_slots = self.browser_slots
+
+    def concurrency_for(self, scraper: BaseScraper) -> int:
+        return max(1, RETAILER_CONCURRENCY.get(scraper.retailer_key, RETAILER_CONCURRENCY['default']))
+
+    def start(self):
+        """Start the per-retailer workers"""
+        if self._workers:
+            return
+        for scraper in self.scrapers:
+            for _ in range(self.concurrency_for(scraper)):
+                self._workers.append(asyncio.ensure_future(self._worker(scraper)))
+
+    def submit(self, scraper: BaseScraper, product: Dict, budget: Optional[SharedDeadline] = None) -> asyncio.Future:
+        """Queue a search, with the product's shared time budget if any, and return a future for its result"""
+        future = asyncio.get_event_loop().create_future()
+        self._queues[scraper.retailer_key].put_nowait((product, budget, future))
+        return future
+
+    async def _worker(self, scraper: BaseScraper):
+        queue = self._queues[scraper.retailer_key]
+        while True:
+            product, budget, future = await queue.get()
+            try:
+                if future.done():
+                    continue
+                self._in_flight[scraper.retailer_key] += 1
+                search = asyncio.ensure_future(scraper.search_product(product, budget))
+                # A caller giving up on the job (e.g. its product ran out of time) cancels the search
+                future.add_done_callback(lambda done, search=search: search.cancel() if done.cancelled() else None)
+                try:
+                    result = await search
+                    if not future.done():
+                        future.set_result(result)
+                except asyncio.CancelledError:
+                    # Only a cancelled job is survivable: the worker itself may be stopped while
+                    # its job is being given up on (the run deadline followed by close())
+                    if self._stopping or not future.cancelled():
+                        raise
+                except Exception as e:
+                    if not future.done():
+                        future.set_exception(e)
+                finally:
+                    self._in_flight[scraper.retailer_key] -= 1
+                    self._completed[scraper.retailer_key] += 1
+            finally:
+                queue.task_done()
+
+    def stats(self) -> Dict:
+        """Queue depth, in-flight and completed searches per retailer, plus browser pages in use"""
+        return {
+            'queued': {key: queue.qsize() for key, queue in self._queues.items()},
+            'in_flight': dict(self._in_flight),
+            'completed': dict(self._completed),
+            'browser_pages_in_use': self.browser_slots.in_use,
+        }
+
+    def describe(self) -> str:
+        stats = self.stats()
+        queued = sum(stats['queued'].values())
+        in_flight = sum(stats['in_flight'].values())
+        return (f"{queued} queued, {in_flight} in flight, "
+                f"{stats['browser_pages_in_use']}/{self.max_browser_pages} browser pages")
+
+    async def close(self):
+        """Stop the workers"""
+        self._stopping = True
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._stopping = False
@@ -1,13 +1,55 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Optional, Union
+from contextlib import asynccontextmanager
+from itertools import islice
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
 import asyncio
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from datetime import datetime
+from urllib.parse import urlsplit
 import re
 import random
 import time
 import os
 
+from .driver_pool import DriverPool
+from .parse_pool import get_parse_executor, parse_in_worker
+from .rate_limiter import get_rate_limiter
+from .circuit_breaker import CircuitBreaker
+from .deadlines import SharedDeadline, deadline, time_left
+from .retry_policy import (
+    RetryPolicy, SearchFailure, classify_exception, FAILURE_BOT_WALL, FAILURE_PARSE_MISS, FAILURE_FETCH_ERROR,
+)
+from .fetch_engines import FetchResult, HttpFetchEngine, SeleniumFetchEngine
+from .resource_blocking import apply_chrome_blocking, firefox_preferences
+from .shared_browser import exclusive
+from utils.helpers import (
+    is_bot_wall, extract_model_number, normalize_model_number, title_has_model, calculate_similarity,
+)
+from utils.structured_data import extract_structured_records
+from utils.html_parsing import make_soup
+from utils.fingerprints import fingerprint_results
+from utils.metrics import METRICS
+from utils.session_store import session_for, to_cdp_cookie
+from config.settings import (
+    DRIVER_POOL_MIN_SIZE, DRIVER_POOL_MAX_SIZE, DRIVER_RECYCLE_AFTER,
+    READY_TIMEOUTS, SELENIUM_TIMEOUT, FETCH_MODES, RATE_LIMITS, MAX_CANDIDATES, MIN_MATCH_SCORE,
+    RESOURCE_BLOCKING_ENABLED, SESSIONS_ENABLED, SESSION_DIR, SESSION_POLICIES,
+    CIRCUIT_BREAKER_ENABLED, CIRCUIT_BREAKERS, RETRY_POLICIES, PAGE_LOAD_TIMEOUT, SEARCH_TIMEOUT,
+    PRODUCT_TIMEOUT,
+)
+
+# Result statuses
+STATUS_OK = "ok"
+STATUS_NO_RESULTS = "no_results"
+# The search page came back without a single result card
+STATUS_EMPTY_PAGE = "empty_page"
+STATUS_UNCHANGED = "unchanged"
+STATUS_ERROR = "error"
+# Replay mode only: the page was never cached, so nothing is known about the retailer
+STATUS_NOT_CACHED = "not_cached"
+STATUS_SKIPPED_UNHEALTHY = "skipped_unhealthy"
+STATUS_TIMED_OUT = "timed_out"
+
 # Define fallback user agents
 FALLBACK_USER_AGENTS = [
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
@@ -17,104 +59,569 @@ FALLBACK_USER_AGENTS = [
 ]
 
 class BaseScraper(ABC):
+    # CSS selector for the search results container; the page is considered
+    # ready as soon as it matches. Subclasses set this to the cards they parse.
+    ready_selector = ""
+    # Whether to look for embedded JSON (JSON-LD, __NEXT_DATA__, Algolia hits)
+    # before falling back to the scraper's own selector logic
+    use_structured_data = True
+    # Result cards to keep when parsing: a CSS selector used to pre-slice the
+    # page (selectolax backend) and a SoupStrainer used while building the
+    # tree. Pages where neither matches are parsed in full.
+    results_selector = ""
+    results_strainer: Optional[SoupStrainer] = None
+    # How many result cards to consider when picking the match for a product
+    max_candidates = MAX_CANDIDATES
+
     def __init__(self, website: str, base_url: str):
-        self.website = website
-        self.base_url = base_url
-        self.driver = None
+        self._init_parsing(website, base_url)
+        # Shared PageCache, assigned by PriceScraper when caching is enabled
+        self.page_cache = None
+        # Last run's result fingerprints, shared across scrapers and assigned by PriceScraper
+        self.fingerprints = None
+        # Global browser page budget, assigned by the CrawlScheduler
+        self.browser_slots = None
+        # SharedBrowser handing out tabs instead of per-retailer browsers, assigned by PriceScraper
+        self.shared_browser = None
+        self.driver_pool = DriverPool(
+            website,
+            self.start_driver,
+            min_size=DRIVER_POOL_MIN_SIZE,
+            max_size=DRIVER_POOL_MAX_SIZE,
+            max_pages=DRIVER_RECYCLE_AFTER,
+        )
         try:
             from fake_useragent import UserAgent
             self.user_agent = UserAgent().random
         except:
             self.user_agent = random.choice(FALLBACK_USER_AGENTS)
 
-    async def get_selenium_driver(self):
-        """Initialize and return a Selenium WebDriver"""
-        if self.driver is None:
+        # Cookies shared by this retailer's drivers and HTTP session, kept between runs
+        self.session = None
+        if SESSIONS_ENABLED:
+            self.session = session_for(self.retailer_key, SESSION_DIR,
+                                       SESSION_POLICIES.get(self.retailer_key, SESSION_POLICIES['default']))
+
+        # Fetch engines: plain HTTP is tried first for server-rendered retailers
+        self.fetch_mode = FETCH_MODES.get(self.retailer_key, 'selenium')
+        self.http_engine = HttpFetchEngine(user_agent=self.user_agent, session=self.session)
+        self.selenium_engine = SeleniumFetchEngine(self)
+
+        # Request pacing, shared by every fetch against this retailer's domain
+        self.rate_limiter = get_rate_limiter(
+            urlsplit(base_url or '').netloc or self.retailer_key,
+            RATE_LIMITS.get(self.retailer_key, RATE_LIMITS['default']),
+        )
+
+        # Which failed searches are tried again, and how long to back off first
+        self.retry_policy = RetryPolicy(**RETRY_POLICIES.get(self.retailer_key, RETRY_POLICIES['default']))
+
+        # Fails fast while the retailer keeps erroring or coming back empty
+        self.breaker = None
+        if CIRCUIT_BREAKER_ENABLED:
+            self.breaker = CircuitBreaker(self.website,
+                                          **CIRCUIT_BREAKERS.get(self.retailer_key, CIRCUIT_BREAKERS['default']))
+
+    def _init_parsing(self, website: str, base_url: str):
+        """The attributes extract_result needs; nothing here touches disk, network or browsers"""
+        self.website = website
+        self.base_url = base_url
+        self.retailer_key = website.lower()
+        self.max_ready_wait = READY_TIMEOUTS.get(self.retailer_key, SELENIUM_TIMEOUT)
+
+    @classmethod
+    def for_parsing(cls, website: str, base_url: str) -> 'BaseScraper':
+        """A scraper that can only extract results from pages, e.g. in a parsing worker.
+
+        Skips the driver pool, HTTP client, session store, user agent lookup,
+        rate limiter and circuit breaker that a full scraper sets up.
+        """
+        scraper = cls.__new__(cls)
+        scraper._init_parsing(website, base_url)
+        return scraper
+
+    def start_driver(self):
+        """Start a driver for the pool (a tab in shared-browser mode), timing browser startup"""
+        with METRICS.timer('driver_start', self.retailer_key):
+            if self.shared_browser is not None:
+                return self.shared_browser.open_tab(self.retailer_key, self.user_agent)
+            return self.create_selenium_driver()
+
+    def create_selenium_driver(self):
+        """Create a new Selenium WebDriver (blocking, called from a worker thread)"""
+        try:
+            from selenium import webdriver
+            from selenium.webdriver.chrome.options import Options
+            
+            options = Options()
+            options.add_argument("--headless")
+            options.add_argument("--no-sandbox")
+            options.add_argument("--disable-dev-shm-usage")
+            options.add_argument(f"user-agent={self.user_agent}")
+            # Hand control back at DOMContentLoaded; readiness is checked explicitly
+            options.page_load_strategy = "eager"
+            
+            # Disable images for faster loading
+            prefs = {"profile.managed_default_content_settings.images": 2}
+            options.add_experimental_option("prefs", prefs)
+            
+            # Simple initialization - let Selenium find the driver
+            driver = webdriver.Chrome(options=options)
+            driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+
+            # Block fonts, stylesheets, media and trackers the results list doesn't need
+            if RESOURCE_BLOCKING_ENABLED:
+                try:
+                    apply_chrome_blocking(driver, self.retailer_key)
+                except Exception as e:
+                    print(f"[{self.website}] Could not enable resource blocking: {str(e)}")
+            return driver
+        except Exception as e:
+            print(f"Error initializing Chrome for {self.website}: {str(e)}")
+            # Try Firefox as fallback
             try:
                 from selenium import webdriver
-                from selenium.webdriver.chrome.options import Options
+                from selenium.webdriver.firefox.options import Options as FirefoxOptions
                 
-                options = Options()
+                options = FirefoxOptions()
                 options.add_argument("--headless")
-                options.add_argument("--no-sandbox")
-                options.add_argument("--disable-dev-shm-usage")
-                options.add_argument(f"user-agent={self.user_agent}")
-                
-                # Disable images for faster loading
-                prefs = {"profile.managed_default_content_settings.images": 2}
-                options.add_experimental_option("prefs", prefs)
+                options.page_load_strategy = "eager"
+                if RESOURCE_BLOCKING_ENABLED:
+                    for name, value in firefox_preferences(self.retailer_key).items():
+                        options.set_preference(name, value)
                 
-                # Simple initialization - let Selenium find the driver
-                self.driver = webdriver.Chrome(options=options)
-                self.driver.set_page_load_timeout(30)  # 30 second timeout
-            except Exception as e:
-                print(f"Error initializing Chrome for {self.website}: {str(e)}")
-                # Try Firefox as fallback
+                driver = webdriver.Firefox(options=options)
+                driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+                return driver
+            except Exception as e2:
+                print(f"Firefox fallback also failed: {str(e2)}")
+                raise Exception("Could not initialize any browser driver")
+
+    async def warm_up(self):
+        """Start the pool's minimum drivers up front for retailers that always need a browser"""
+        if self.fetch_mode == 'http_first':
+            return
+        if self.page_cache is not None and self.page_cache.replay:
+            return
+        await self.driver_pool.warm_up()
+
+    @asynccontextmanager
+    async def browser_page(self):
+        """Hold one of the scheduler's global browser page slots while a page is live"""
+        if self.browser_slots is None:
+            yield
+            return
+        async with self.browser_slots:
+            yield
+
+    def restore_session(self, pooled) -> bool:
+        """Bring a driver's cookies in line with the retailer's session (blocking).
+
+        Only does work for a new driver or after the session was rotated.
+        Returns False when the cookies couldn't be set before navigating.
+        """
+        driver = pooled.driver
+        if self.session is None:
+            # No session store: every page starts without cookies
+            with exclusive(driver) as page_driver:
+                self.clear_cookies(page_driver)
+            return True
+        if pooled.state.get('session_version') == self.session.version:
+            return True
+
+        cookies = self.session.cookies()
+        with exclusive(driver) as page_driver:
+            # Drops whatever the driver collected on the rotated session
+            self.clear_cookies(page_driver)
+            if cookies:
                 try:
-                    from selenium import webdriver
-                    from selenium.webdriver.firefox.options import Options as FirefoxOptions
-                    
-                    options = FirefoxOptions()
-                    options.add_argument("--headless")
-                    
-                    self.driver = webdriver.Firefox(options=options)
-                    self.driver.set_page_load_timeout(30)
-                except Exception as e2:
-                    print(f"Firefox fallback also failed: {str(e2)}")
-                    raise Exception("Could not initialize any browser driver")
-                    
-        return self.driver
-
-    async def get_page(self, url: str) -> Optional[str]:
-        """Get the page content using Selenium"""
-        
+                    # DevTools can set cookies for a domain the driver hasn't visited yet
+                    page_driver.execute_cdp_cmd('Network.setCookies',
+                                                {'cookies': [to_cdp_cookie(cookie) for cookie in cookies]})
+                except Exception:
+                    return False
+        pooled.state['session_version'] = self.session.version
+        return True
+
+    def clear_cookies(self, driver):
+        """Delete the retailer's cookies from a driver (blocking).
+
+        delete_all_cookies only reaches the page that's open, and shared-browser
+        tabs start on about:blank in a profile that keeps cookies between runs,
+        so the retailer's cookies are deleted by domain over DevTools.
+        """
+        site = urlsplit(self.base_url or '').netloc.lower()
+        site = site[4:] if site.startswith('www.') else site
+        try:
+            stored = driver.execute_cdp_cmd('Network.getAllCookies', {}).get('cookies', [])
+            for cookie in stored:
+                domain = cookie.get('domain', '').lstrip('.').lower()
+                if site and (domain == site or domain.endswith('.' + site)):
+                    driver.execute_cdp_cmd('Network.deleteCookies', {
+                        'name': cookie['name'], 'domain': cookie['domain'], 'path': cookie.get('path', '/'),
+                    })
+        except Exception:
+            # No DevTools (Firefox): clear what the open page can see
+            try:
+                driver.delete_all_cookies()
+            except Exception:
+                pass
+
+    def save_session(self, pooled, restored: bool = True):
+        """Read the driver's cookies back into the retailer's session (blocking)"""
+        if self.session is None:
+            return
+        with exclusive(pooled.driver) as page_driver:
+            if not restored:
+                # Without DevTools, cookies can only be added while on the site, for the next page
+                for cookie in self.session.cookies():
+                    try:
+                        page_driver.add_cookie(cookie)
+                    except Exception:
+                        pass
+                pooled.state['session_version'] = self.session.version
+            self.session.update(page_driver.get_cookies())
+
+    def set_page_load_timeout(self, pooled, seconds: float):
+        """Cap the driver's next navigation to what's left of the search's budget (blocking)"""
+        if pooled.state.get('page_load_timeout', PAGE_LOAD_TIMEOUT) != seconds:
+            pooled.driver.set_page_load_timeout(seconds)
+            pooled.state['page_load_timeout'] = seconds
+
+    def wait_until_ready(self, driver, timeout: Optional[float] = None) -> Optional[float]:
+        """Block until the results container is present (called from a worker thread).
+
+        Returns the time-to-ready in seconds, or None if the container did not
+        show up within the retailer's maximum wait.
+        """
+        if not self.ready_selector:
+            return None
+
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException
+
+        start = time.monotonic()
         try:
-            driver = await self.get_selenium_driver()
-            if not driver:
-                print("No WebDriver available")
+            WebDriverWait(driver, timeout or self.max_ready_wait, poll_frequency=0.2).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, self.ready_selector))
+            )
+        except TimeoutException:
+            print(f"[{self.website}] Results not ready after {timeout or self.max_ready_wait}s")
+            return None
+
+        return time.monotonic() - start
+
+    def has_results(self, page_content: str) -> bool:
+        """Check whether a fetched page already contains the results container"""
+        if not self.ready_selector:
+            return True
+        soup = self.parse_page(page_content, scoped_only=True)
+        return soup.select_one(self.ready_selector) is not None
+
+    def needs_browser(self, result: FetchResult) -> str:
+        """Return why an HTTP response needs JS rendering, or '' if it is usable"""
+        if not result.content:
+            return result.error or "empty response"
+        if result.status and result.status != 200:
+            return f"HTTP {result.status}"
+        if is_bot_wall(result.content):
+            return "bot wall"
+        # A browser fetch already waited for the results container; only parse for it otherwise
+        if not (result.ready if result.ready is not None else self.has_results(result.content)):
+            return "empty result container"
+        return ""
+
+    def record_response(self, result: FetchResult, reason: str):
+        """Feed throttling signals from a response into the retailer's rate limiter"""
+        if result.status in (429, 503) or reason == "bot wall":
+            self.rate_limiter.record_throttled(reason)
+            if self.session is not None:
+                self.session.record_challenge(reason or f"HTTP {result.status}")
+        elif reason == "empty result container" and result.engine != HttpFetchEngine.name:
+            # A rendered page without results is often a soft block
+            self.rate_limiter.record_throttled(reason, factor=0.8)
+        elif not reason:
+            self.rate_limiter.record_healthy()
+            if self.session is not None:
+                self.session.record_page()
+
+    async def fetch_page(self, url: str) -> str:
+        """Fetch the page content, over plain HTTP first where the retailer allows it.
+
+        Raises SearchFailure when no page could be fetched.
+        """
+        if self.fetch_mode == 'http_first':
+            await self.rate_limiter.acquire()
+            with METRICS.timer('http_fetch', self.retailer_key):
+                result = await self.http_engine.fetch(url)
+            reason = self.needs_browser(result)
+            self.record_response(result, reason)
+            if not reason:
+                return result.content
+            print(f"[{self.website}] Escalating to Selenium ({reason}): {url}")
+
+        await self.rate_limiter.acquire()
+        result = await self.selenium_engine.fetch(url)
+        if not result.content:
+            raise SearchFailure(result.failure or FAILURE_FETCH_ERROR, result.error)
+        self.record_response(result, self.needs_browser(result))
+        return result.content
+
+    async def get_page(self, url: str, use_cache: bool = True) -> Optional[str]:
+        """Get the page content from the page cache, fetching it on a miss.
+
+        ``use_cache=False`` refetches a cached page, e.g. when retrying one
+        that couldn't be parsed. Returns None only in replay mode.
+        """
+        if self.page_cache is not None and (use_cache or self.page_cache.replay):
+            cached = self.page_cache.get(self.retailer_key, url)
+            if cached is not None:
+                print(f"[{self.website}] Page cache hit: {url}")
+                return cached
+            if self.page_cache.replay:
+                print(f"[{self.website}] Not in page cache (replay mode): {url}")
                 return None
-                
-            # Define a function to run in a separate thread
-            def fetch_with_selenium():
-                try:
-                    # Add random delay
-                    time.sleep(1 + random.random() * 2)
-                    
-                    # Clear cookies
-                    driver.delete_all_cookies()
-                    
-                    # Visit page
-                    driver.get(url)
-                    
-                    # Wait for page to load
-                    time.sleep(5)  # Static wait for elements to load
-                    
-                    # Scroll down for lazy-loaded content
-                    for _ in range(3):
-                        driver.execute_script("window.scrollBy(0, 500)")
-                        time.sleep(0.5)
-                    
-                    # Get page source
-                    return driver.page_source
-                except Exception as e:
-                    print(f"Error in Selenium fetch: {str(e)}")
-                    return None
-            
-            # Execute in a thread pool
-            loop = asyncio.get_event_loop()
-            page_content = await loop.run_in_executor(None, fetch_with_selenium)
-            
-            return page_content
-        except Exception as e:
-            print(f"Error fetching {url}: {str(e)}")
-        return None
+
+        page_content = await self.fetch_page(url)
+
+        if self.page_cache is not None and page_content and not is_bot_wall(page_content):
+            try:
+                self.page_cache.put(self.retailer_key, url, page_content)
+            except OSError as e:
+                print(f"[{self.website}] Could not write page cache: {str(e)}")
+        return page_content
+
+    @abstractmethod
+    def build_search_url(self, product: Dict) -> str:
+        """Build the retailer's search URL for a product"""
+        pass
 
     @abstractmethod
-    async def search_product(self, product: Dict) -> Dict:
-        """Search for a product and return its details"""
+    def iter_candidates(self, soup: BeautifulSoup) -> Iterator[Tuple[str, float]]:
+        """Yield (title, price) for the result cards on a search page, in page order"""
         pass
 
-    def format_result(self, product: Dict, title: str, price: Union[str, float, None], price_valid_till: str = "") -> Dict:
+    def parse_page(self, page_content: str, scoped_only: bool = False) -> BeautifulSoup:
+        """Build the DOM tree that iter_candidates walks.
+
+        Only the result cards are parsed when the scraper declares them; if
+        that yields nothing the whole page is parsed so the scraper's
+        alternate selectors still get a chance (unless ``scoped_only``).
+        """
+        if self.results_strainer is None and not self.results_selector:
+            return make_soup(page_content)
+
+        soup = make_soup(page_content, self.results_strainer, self.results_selector or self.ready_selector)
+        if soup.find() is not None or scoped_only:
+            return soup
+        return make_soup(page_content)
+
+    def select_match(self, product: Dict, candidates: Iterable[Tuple[str, float]]) -> Optional[Tuple[str, float]]:
+        """Pick the candidate for a product from the top ``max_candidates`` cards.
+
+        A title containing the query's model number wins outright; otherwise
+        the title most similar to the query is used if it scores at least
+        MIN_MATCH_SCORE.
+        """
+        query = product['name']
+        model = extract_model_number(query)
+        model = normalize_model_number(model) if model != query else ""
+
+        best, best_score = None, -1.0
+        for title, price in islice(candidates, self.max_candidates):
+            if title_has_model(title, model):
+                print(f"[{self.website}] Model number match: {title}")
+                return title, price
+            score = calculate_similarity(query, title)
+            if score > best_score:
+                best, best_score = (title, price), score
+
+        if best is not None and best_score >= MIN_MATCH_SCORE:
+            print(f"[{self.website}] Closest match ({best_score:.2f}): {best[0]}")
+            return best
+        if best is not None:
+            print(f"[{self.website}] No result close enough to '{query}' (best {best_score:.2f}: {best[0]})")
+        return None
+
+    def extract_result(self, product: Dict, page_content: str) -> Dict:
+        """Extract the result for a product from a search page"""
+        with METRICS.timer('extract', self.retailer_key):
+            # Fast path: embedded JSON, no DOM parsing needed
+            records = []
+            if self.use_structured_data:
+                records = extract_structured_records(page_content)
+                match = self.select_match(product, ((record['title'], record['price']) for record in records))
+                if match is not None:
+                    print(f"[{self.website}] Structured data result: {match[0]}, ${match[1]}")
+                    return self.format_result(product, match[0], match[1], "")
+
+            # Fall back to walking the DOM with the scraper's selectors
+            with METRICS.timer('parse', self.retailer_key):
+                soup = self.parse_page(page_content)
+            seen = [0]
+
+            def counted(candidates):
+                for candidate in candidates:
+                    seen[0] += 1
+                    yield candidate
+
+            match = self.select_match(product, counted(self.iter_candidates(soup)))
+            if match is not None:
+                return self.format_result(product, match[0], match[1], "")
+
+            if not seen[0] and self.ready_selector and soup.select_one(self.ready_selector) is not None:
+                # Result cards are on the page but none could be read: a partial render, worth another try
+                raise SearchFailure(FAILURE_PARSE_MISS, "result cards present but none parsed")
+
+            if not seen[0] and not records:
+                print(f"[{self.website}] No result cards on the page")
+                return self.format_result(product, "", None, status=STATUS_EMPTY_PAGE)
+
+            print(f"[{self.website}] No matching products found")
+            return self.format_result(product, "", None)
+
+    async def run_parser(self, method: str, *args):
+        """Run a parsing method in the parsing process pool, keeping the event loop free"""
+        executor = get_parse_executor()
+        if executor is None:
+            return getattr(self, method)(*args)
+
+        loop = asyncio.get_event_loop()
+        scraper_class = type(self)
+        value, samples = await loop.run_in_executor(
+            executor, parse_in_worker,
+            scraper_class.__module__, scraper_class.__name__, self.website, self.base_url, method, *args,
+        )
+        METRICS.replay(samples)
+        return value
+
+    async def run_extraction(self, product: Dict, page_content: str) -> Dict:
+        """Run extract_result in the parsing process pool"""
+        return await self.run_parser('extract_result', product, page_content)
+
+    def fingerprint_page(self, page_content: str) -> str:
+        """Cheap fingerprint of the result cards this scraper would parse"""
+        return fingerprint_results(page_content, self.results_selector or self.ready_selector, self.results_strainer)
+
+    def extract_if_changed(self, product: Dict, page_content: str,
+                           previous_fingerprint: Optional[str]) -> Tuple[str, Optional[Dict]]:
+        """Fingerprint the page, extracting its result only if the fingerprint isn't ``previous_fingerprint``"""
+        fingerprint = self.fingerprint_page(page_content)
+        if fingerprint == previous_fingerprint:
+            return fingerprint, None
+        return fingerprint, self.extract_result(product, page_content)
+
+    async def search_product(self, product: Dict, budget: Optional[SharedDeadline] = None) -> Dict:
+        """Search for a product and return its details, recording its latency and outcome.
+
+        ``budget`` is the product's PRODUCT_TIMEOUT, shared by its searches at
+        every retailer and started by whichever leaves its queue first; without
+        one the search gets a PRODUCT_TIMEOUT of its own from here.
+        """
+        if self.breaker is not None and not self.breaker.allow():
+            print(f"[{self.website}] Skipping '{product['name']}': retailer unhealthy")
+            METRICS.increment('searches', self.retailer_key, STATUS_SKIPPED_UNHEALTHY)
+            return self.format_result(product, "", None, status=STATUS_SKIPPED_UNHEALTHY)
+
+        seconds = PRODUCT_TIMEOUT
+        if budget is not None:
+            budget.start()
+            left = budget.time_left()
+            # A zero deadline means no limit, so keep a spent budget just above it
+            seconds = 0 if left is None else max(0.01, left)
+
+        try:
+            with METRICS.timer('search', self.retailer_key), deadline(seconds):
+                try:
+                    result = await asyncio.wait_for(self._search_product(product), seconds or None)
+                except asyncio.TimeoutError:
+                    print(f"[{self.website}] Search for '{product['name']}' ran out of its {PRODUCT_TIMEOUT:g}s budget")
+                    result = self.format_result(product, "", None, status=STATUS_TIMED_OUT)
+        except BaseException:
+            if self.breaker is not None:
+                # A cancelled probe mustn't leave the breaker waiting on it
+                self.breaker.release_probe()
+            raise
+        status = result.get('Status') or STATUS_OK
+        METRICS.increment('searches', self.retailer_key, status)
+        self.record_outcome(status)
+        return result
+
+    def record_outcome(self, status: str):
+        """Feed a search's outcome into the retailer's circuit breaker"""
+        if self.breaker is None:
+            return
+        if status in (STATUS_OK, STATUS_UNCHANGED, STATUS_NO_RESULTS):
+            # Cards that don't match the query still mean the retailer is serving results
+            self.breaker.record_success()
+        elif status == STATUS_EMPTY_PAGE:
+            self.breaker.record_empty()
+        elif status in (STATUS_ERROR, STATUS_TIMED_OUT):
+            self.breaker.record_failure()
+        else:
+            # Nothing was fetched (e.g. a replay cache miss); if this was the probe, let another search probe
+            self.breaker.release_probe()
+
+    async def _search_product(self, product: Dict) -> Dict:
+        """Run search attempts until one succeeds or the retry policy gives up"""
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                with deadline(SEARCH_TIMEOUT):
+                    return await asyncio.wait_for(self.attempt_search(product, attempt), SEARCH_TIMEOUT or None)
+            except Exception as e:
+                kind = classify_exception(e)
+                print(f"[{self.website}] Attempt {attempt} failed ({kind}): {str(e)}")
+
+            METRICS.increment('failures', self.retailer_key, kind)
+            if not self.retry_policy.should_retry(kind, attempt):
+                return self.format_result(product, "", None, status=STATUS_ERROR)
+            delay = self.retry_policy.backoff(attempt)
+            if time_left(delay + 1) <= delay:
+                print(f"[{self.website}] No time left to retry '{product['name']}'")
+                return self.format_result(product, "", None, status=STATUS_ERROR)
+            print(f"[{self.website}] Retrying '{product['name']}' in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def attempt_search(self, product: Dict, attempt: int = 1) -> Dict:
+        """One search attempt; raises on any failure worth classifying"""
+        search_url = self.build_search_url(product)
+        print(f"[{self.website}] Searching: {search_url}")
+
+        # A retry refetches rather than getting the failed page back from the cache
+        page_content = await self.get_page(search_url, use_cache=attempt == 1)
+        if page_content is None and self.page_cache is not None and self.page_cache.replay:
+            return self.format_result(product, "", None, status=STATUS_NOT_CACHED)
+        if not page_content:
+            print(f"[{self.website}] No page content returned")
+            return self.format_result(product, "", None, status=STATUS_ERROR)
+        if is_bot_wall(page_content):
+            raise SearchFailure(FAILURE_BOT_WALL, "captcha or robot check page")
+
+        if self.fingerprints is None:
+            return await self.run_extraction(product, page_content)
+
+        # Skip extraction when the result cards haven't changed since the last run; the
+        # fingerprint is a parse of its own, so it's taken in the parsing pool too
+        product_key = normalize_model_number(extract_model_number(product['name']))
+        previous = self.fingerprints.get(self.retailer_key, product_key)
+        fingerprint, result = await self.run_parser(
+            'extract_if_changed', product, page_content, previous[0] if previous is not None else None,
+        )
+        if result is None:
+            print(f"[{self.website}] Results unchanged since last run")
+            self.fingerprints.unchanged += 1
+            return {**previous[1], "Status": STATUS_UNCHANGED}
+
+        if result.get('Title'):
+            self.fingerprints.put(self.retailer_key, product_key, fingerprint, result)
+        return result
+
+    def format_result(self, product: Dict, title: str, price: Union[str, float, None], price_valid_till: str = "",
+                      status: str = "") -> Dict:
         """Format the scraping result"""
         # Handle empty or None price
         if price is None or price == "":
@@ -133,17 +640,16 @@ class BaseScraper(ABC):
             "Website": self.website,
             "Title": title,
             "Price": formatted_price,
-            "PriceValidTill": price_valid_till
+            "PriceValidTill": price_valid_till,
+            "Status": status or (STATUS_OK if title else STATUS_NO_RESULTS),
         }
         
     async def close(self):
-        """Close the Selenium driver"""
-        if self.driver:
-            try:
-                self.driver.quit()
-            except Exception as e:
-                print(f"Error closing WebDriver: {str(e)}")
-            self.driver = None
+        """Close the HTTP session and all pooled Selenium drivers, saving the retailer's session"""
+        await self.http_engine.close()
+        await self.selenium_engine.close()
+        if self.session is not None:
+            self.session.save()
 
     def extract_price_valid_till(self, soup: BeautifulSoup) -> str:
         """Extract price validity date from various common patterns"""
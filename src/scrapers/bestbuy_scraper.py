@@ -1,79 +1,74 @@
 from .base_scraper import BaseScraper
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import re
-from typing import Dict
+from typing import Dict, Iterator, Tuple
 from urllib.parse import quote_plus
 
+# Best Buy's CSS-module classes end in a build hash (productLine_2N9kG); match on the stable prefix
+PRODUCT_CARD_SELECTOR = 'li[class*="productLine_"]'
+PRODUCT_TITLE_SELECTOR = 'h3[class*="productItemName_"]'
+
+
 class BestBuyScraper(BaseScraper):
+    ready_selector = f'{PRODUCT_CARD_SELECTOR}, div[data-automation="product-price"]'
+    results_selector = PRODUCT_CARD_SELECTOR
+    results_strainer = SoupStrainer('li', class_=re.compile(r'^productLine_'))
+
     def __init__(self, base_url: str):
         super().__init__('BestBuy', base_url)
 
-    async def search_product(self, product: Dict) -> Dict:
-        try:
-            # Format search query
-            search_query = product['name'].replace('"', '').replace('"', '')
-            search_url = f"{self.base_url}/en-ca/search?search={quote_plus(search_query)}"
-            print(f"[BestBuy] Searching: {search_url}")
-            
-            # Get the page content using get_page method from BaseScraper
-            page_content = await self.get_page(search_url)
-            if not page_content:
-                return self.format_result(product, "", None)
+    def build_search_url(self, product: Dict) -> str:
+        # Format search query
+        search_query = product['name'].replace('"', '').replace('"', '')
+        return f"{self.base_url}/en-ca/search?search={quote_plus(search_query)}"
+
+    def iter_candidates(self, soup: BeautifulSoup) -> Iterator[Tuple[str, float]]:
+        # Find all products in search results
+        product_items = soup.select(PRODUCT_CARD_SELECTOR)
+        print(f"[BestBuy] Found {len(product_items)} product items")
+
+        if not product_items:
+            # Try alternative selectors if the main one doesn't work
+            for selector in ['div[role="region"] li', '.productList li']:
+                product_items = soup.select(selector)
+                if product_items:
+                    print(f"[BestBuy] Found {len(product_items)} products with alternate selector: {selector}")
+                    break
+
+        if not product_items:
+            print("[BestBuy] No products found on page")
+            return
+
+        # Process the first few products
+        for product_item in product_items[:self.max_candidates]:
+            # Get product title
+            title_element = product_item.select_one(PRODUCT_TITLE_SELECTOR)
+            if not title_element:
+                title_element = product_item.select_one('[itemprop="name"]')
+
+            if not title_element:
+                continue
+
+            title = title_element.text.strip()
+            print(f"[BestBuy] Found product: {title}")
+
+            # Get price
+            price = None
+            price_element = product_item.select_one('div[data-automation="product-price"]')
+
+            if price_element:
+                price_text = price_element.text.strip()
+                price_match = re.search(r'[\d,]+\.\d+', price_text)
+                if price_match:
+                    price_str = price_match.group().replace('$', '').replace(',', '')
+                    try:
+                        price = float(price_str)
+                        print(f"[BestBuy] Found price: ${price}")
+                    except ValueError:
+                        pass
 
-            soup = BeautifulSoup(page_content, 'html.parser')
-            
-            # Find all products in search results
-            product_items = soup.select('li.productLine_2N9kG')
-            print(f"[BestBuy] Found {len(product_items)} product items")
-            
-            if not product_items:
-                # Try alternative selectors if the main one doesn't work
-                for selector in ['div[role="region"] li', '.productList li']:
-                    product_items = soup.select(selector)
-                    if product_items:
-                        print(f"[BestBuy] Found {len(product_items)} products with alternate selector: {selector}")
-                        break
-            
-            if not product_items:
-                print("[BestBuy] No products found on page")
-                return self.format_result(product, "", None)
+            if not price:
+                print("[BestBuy] No valid price found")
+                continue
 
-            # Process the first few products
-            for product_item in product_items[:5]:
-                # Get product title
-                title_element = product_item.select_one('h3.productItemName_3IZ3c')
-                if not title_element:
-                    title_element = product_item.select_one('[itemprop="name"]')
-                
-                if not title_element:
-                    continue
-                    
-                title = title_element.text.strip()
-                print(f"[BestBuy] Found product: {title}")
-                
-                # Get price
-                price = None
-                price_element = product_item.select_one('div[data-automation="product-price"]')
-                
-                if price_element:
-                    price_text = price_element.text.strip()
-                    price_match = re.search(r'[\d,]+\.\d+', price_text)
-                    if price_match:
-                        price_str = price_match.group().replace('$', '').replace(',', '')
-                        try:
-                            price = float(price_str)
-                            print(f"[BestBuy] Found price: ${price}")
-                        except ValueError:
-                            pass
-                
-                if not price:
-                    print("[BestBuy] No valid price found")
-                    continue
-                
-                
-                return self.format_result(product, title, price, "")
-            
-            return self.format_result(product, "", None)
-            
-        except Exception as e:
-            return self.format_result(product, "", None) 
\ No newline at end of file
+            yield title, price
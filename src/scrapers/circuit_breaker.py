@@ -0,0 +1,96 @@
+from typing import Dict
+import time
+
+# Breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Per-retailer breaker that stops searching a site that keeps failing.
+
+    Consecutive errors (``failure_threshold``) or consecutive searches
+    whose page had no result cards, errors included (``empty_threshold``), open the
+    breaker: searches are then skipped without fetching anything. After
+    ``cool_down`` seconds one probe search is let through; if it finds a
+    result the breaker closes, otherwise it reopens with the cool-down
+    doubled, up to ``max_cool_down``.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, empty_threshold: int = 10,
+                 cool_down: float = 60, max_cool_down: float = 600):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.empty_threshold = empty_threshold
+        self.base_cool_down = cool_down
+        self.cool_down = cool_down
+        self.max_cool_down = max_cool_down
+        self.state = CLOSED
+        self.failures = 0
+        self.empties = 0
+        self.opened = 0
+        self.skipped = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    def allow(self) -> bool:
+        """Whether a search may run now; counts the ones turned away"""
+        if self.state == OPEN and time.monotonic() - self._opened_at >= self.cool_down:
+            self.state = HALF_OPEN
+            print(f"[{self.name}] Circuit half-open, sending a probe search")
+        if self.state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        if self.state == CLOSED:
+            return True
+        self.skipped += 1
+        return False
+
+    def record_success(self):
+        if self.state != CLOSED:
+            print(f"[{self.name}] Circuit closed, retailer is healthy again")
+        self.state = CLOSED
+        self.cool_down = self.base_cool_down
+        self.failures = self.empties = 0
+        self._probing = False
+
+    def record_empty(self):
+        """A search page without a single result card, but without an error either"""
+        self.empties += 1
+        self._record_bad("empty pages")
+
+    def record_failure(self):
+        self.failures += 1
+        self.empties += 1
+        self._record_bad("errors")
+
+    def release_probe(self):
+        """The probe search never finished; let the next search probe instead"""
+        self._probing = False
+
+    def _record_bad(self, reason: str):
+        if self.state == HALF_OPEN and self._probing:
+            # The probe failed: back off for longer before the next one
+            self.cool_down = min(self.max_cool_down, self.cool_down * 2)
+            self._open(f"probe failed with {reason}")
+        elif self.state == CLOSED and (self.failures >= self.failure_threshold
+                                       or self.empties >= self.empty_threshold):
+            self._open(f"{self.failures} errors, {self.empties} empty result pages in a row")
+
+    def _open(self, reason: str):
+        self.state = OPEN
+        self.opened += 1
+        self._opened_at = time.monotonic()
+        self._probing = False
+        print(f"[{self.name}] Circuit open ({reason}), skipping searches for {self.cool_down:.0f}s")
+
+    def health(self) -> Dict:
+        """Breaker state and counters for the end-of-run report"""
+        return {
+            'state': self.state,
+            'consecutive_failures': self.failures,
+            'consecutive_empty': self.empties,
+            'times_opened': self.opened,
+            'skipped': self.skipped,
+        }
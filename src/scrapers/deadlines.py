@@ -0,0 +1,61 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+import asyncio
+import time
+
+# Monotonic time by which the current search must finish, if it has a budget
+_deadline: ContextVar[Optional[float]] = ContextVar('search_deadline', default=None)
+
+
+@contextmanager
+def deadline(seconds: Optional[float]):
+    """Give the enclosed search at most ``seconds``, never extending an outer deadline"""
+    if not seconds:
+        yield
+        return
+    until = time.monotonic() + seconds
+    outer = _deadline.get()
+    token = _deadline.set(until if outer is None else min(outer, until))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def time_left(default: float) -> float:
+    """``default`` capped to what is left of the current deadline.
+
+    Read it on the event loop and pass the value to worker threads: the
+    deadline doesn't follow work handed to ``run_in_executor``.
+    """
+    until = _deadline.get()
+    if until is None:
+        return default
+    return max(0.1, min(default, until - time.monotonic()))
+
+
+class SharedDeadline:
+    """A time budget shared by several searches, e.g. one product's searches at every retailer.
+
+    The clock starts when the first of them calls ``start()``, so time spent
+    waiting in the retailers' queues before any search begins isn't counted.
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.until: Optional[float] = None
+        # Resolved on start(), for callers waiting to learn when the budget runs out
+        self.started = asyncio.get_event_loop().create_future()
+
+    def start(self):
+        if self.until is None and self.seconds:
+            self.until = time.monotonic() + self.seconds
+        if not self.started.done():
+            self.started.set_result(None)
+
+    def time_left(self) -> Optional[float]:
+        """Seconds left, or None while the clock hasn't started or without a limit"""
+        if self.until is None:
+            return None
+        return max(0.0, self.until - time.monotonic())
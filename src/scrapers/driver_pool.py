@@ -0,0 +1,178 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+import asyncio
+import time
+
+from config.settings import BROWSER_THREADS, DRIVER_POOL_MAX_SIZE, MAX_BROWSER_PAGES, WEBSITES
+
+_browser_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_browser_executor() -> ThreadPoolExecutor:
+    """Threads for blocking WebDriver calls, sized to the browser budget.
+
+    The event loop's default executor has only ``cpu_count + 4`` threads, so
+    on a small host page loads, driver starts and quits would queue behind
+    each other well before the driver pools are full.
+    """
+    global _browser_executor
+    if _browser_executor is None:
+        threads = BROWSER_THREADS or max(MAX_BROWSER_PAGES, DRIVER_POOL_MAX_SIZE * len(WEBSITES))
+        _browser_executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='browser')
+    return _browser_executor
+
+
+class PooledDriver:
+    """A WebDriver checked out of a DriverPool, with its usage bookkeeping"""
+
+    def __init__(self, driver: Any):
+        self.driver = driver
+        self.pages_served = 0
+        self.created_at = time.monotonic()
+        # Per-driver bookkeeping for scrapers, e.g. whether consent was already given
+        self.state: Dict[str, Any] = {}
+
+
+class DriverPool:
+    """Bounded pool of Selenium WebDrivers for a single retailer.
+
+    Drivers are created lazily up to ``max_size`` and handed out one caller
+    at a time. A driver is health checked before it is handed out and is
+    recycled once it has served ``max_pages`` pages.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Any], min_size: int = 1,
+                 max_size: int = 3, max_pages: int = 50):
+        self.name = name
+        self.factory = factory
+        self.min_size = max(0, min(min_size, max_size))
+        self.max_size = max(1, max_size)
+        self.max_pages = max_pages
+        self._idle: List[PooledDriver] = []
+        self._size = 0
+        self._closed = False
+        self._condition = asyncio.Condition()
+        # Background quits of aborted drivers, still holding their slots
+        self._aborting = set()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def in_use(self) -> int:
+        return self._size - len(self._idle)
+
+    async def _create(self) -> PooledDriver:
+        loop = asyncio.get_event_loop()
+        driver = await loop.run_in_executor(get_browser_executor(), self.factory)
+        return PooledDriver(driver)
+
+    def _quit(self, pooled: PooledDriver):
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            print(f"[{self.name}] Error closing WebDriver: {str(e)}")
+
+    async def _destroy(self, pooled: PooledDriver):
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(get_browser_executor(), self._quit, pooled)
+
+    async def _is_healthy(self, pooled: PooledDriver) -> bool:
+        def probe():
+            try:
+                # Any round trip to the browser fails once the session is gone
+                pooled.driver.current_url
+                return True
+            except Exception:
+                return False
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(get_browser_executor(), probe)
+
+    async def warm_up(self):
+        """Start drivers until the pool holds at least ``min_size``"""
+        async with self._condition:
+            missing = self.min_size - self._size
+            self._size += max(0, missing)
+        if missing <= 0:
+            return
+
+        results = await asyncio.gather(*[self._create() for _ in range(missing)], return_exceptions=True)
+        async with self._condition:
+            for result in results:
+                if isinstance(result, PooledDriver):
+                    self._idle.append(result)
+                else:
+                    self._size -= 1
+                    print(f"[{self.name}] Could not start WebDriver: {str(result)}")
+            self._condition.notify_all()
+
+    async def checkout(self) -> PooledDriver:
+        """Wait for an idle driver, or start a new one if the pool has room"""
+        while True:
+            async with self._condition:
+                if self._closed:
+                    raise Exception(f"Driver pool for {self.name} is closed")
+                while not self._idle and self._size >= self.max_size:
+                    await self._condition.wait()
+                    if self._closed:
+                        raise Exception(f"Driver pool for {self.name} is closed")
+                pooled = self._idle.pop() if self._idle else None
+                if pooled is None:
+                    # Reserve the slot before starting the browser outside the lock
+                    self._size += 1
+
+            if pooled is None:
+                try:
+                    return await self._create()
+                except Exception:
+                    async with self._condition:
+                        self._size -= 1
+                        self._condition.notify()
+                    raise
+
+            if await self._is_healthy(pooled):
+                return pooled
+
+            print(f"[{self.name}] Discarding unhealthy WebDriver")
+            await self._release_slot(pooled)
+
+    async def checkin(self, pooled: PooledDriver, discard: bool = False):
+        """Return a driver to the pool, recycling it if it is worn out"""
+        pooled.pages_served += 1
+        if discard or self._closed or (self.max_pages and pooled.pages_served >= self.max_pages):
+            await self._release_slot(pooled)
+            return
+
+        async with self._condition:
+            self._idle.append(pooled)
+            self._condition.notify()
+
+    async def abort(self, pooled: PooledDriver):
+        """Drop a driver whose page was abandoned mid-navigation.
+
+        The driver quits in the background, so a cancelled search doesn't wait
+        for the page it gave up on. Its slot is only freed once it has quit,
+        so the pool never runs more than ``max_size`` browsers.
+        """
+        task = asyncio.ensure_future(self._release_slot(pooled))
+        self._aborting.add(task)
+        task.add_done_callback(self._aborting.discard)
+
+    async def _release_slot(self, pooled: PooledDriver):
+        await self._destroy(pooled)
+        async with self._condition:
+            self._size -= 1
+            self._condition.notify()
+
+    async def close(self):
+        """Quit every idle driver and refuse further checkouts"""
+        async with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._condition.notify_all()
+        for pooled in idle:
+            await self._release_slot(pooled)
+        if self._aborting:
+            await asyncio.gather(*self._aborting, return_exceptions=True)
@@ -0,0 +1,208 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, Optional
+import asyncio
+import time
+
+from config.settings import DEFAULT_HEADERS, REQUEST_TIMEOUT, HTTP_CONNECTIONS_PER_HOST, PAGE_LOAD_TIMEOUT
+from utils.metrics import METRICS
+from utils.session_store import SessionStore
+from .driver_pool import get_browser_executor
+from .retry_policy import classify_exception, FAILURE_TIMEOUT, FAILURE_DRIVER_CRASH, FAILURE_FETCH_ERROR
+from .deadlines import time_left
+
+
+@dataclass
+class FetchResult:
+    """Outcome of fetching a single URL through one of the fetch engines"""
+    url: str
+    content: Optional[str]
+    engine: str
+    status: Optional[int] = None
+    error: str = ""
+    # Failure kind for the retry policy when there is no content
+    failure: str = ""
+    # Whether the browser saw the results container before reading the page; None when not waited for
+    ready: Optional[bool] = None
+
+
+class FetchEngine(ABC):
+    name = ""
+
+    @abstractmethod
+    async def fetch(self, url: str) -> FetchResult:
+        """Fetch a URL and return its HTML"""
+        pass
+
+    async def close(self):
+        """Release any connections or browsers held by the engine"""
+        pass
+
+
+def _accept_encoding() -> str:
+    # aiohttp only decodes brotli bodies when a brotli binding is installed
+    try:
+        import brotli  # noqa: F401
+        return "gzip, deflate, br"
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+            return "gzip, deflate, br"
+        except ImportError:
+            return "gzip, deflate"
+
+
+class HttpFetchEngine(FetchEngine):
+    """Plain HTTP fetches over a pooled, keep-alive aiohttp session"""
+    name = "http"
+
+    def __init__(self, user_agent: Optional[str] = None, timeout: float = REQUEST_TIMEOUT,
+                 limit_per_host: int = HTTP_CONNECTIONS_PER_HOST, session: Optional[SessionStore] = None):
+        self.timeout = timeout
+        self.limit_per_host = limit_per_host
+        # Retailer session whose cookies the HTTP client shares with the browsers
+        self.session = session
+        self._session_version = None
+        self.headers: Dict[str, str] = {
+            **DEFAULT_HEADERS,
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'en-CA,en;q=0.9',
+            'Accept-Encoding': _accept_encoding(),
+        }
+        if user_agent:
+            self.headers['User-Agent'] = user_agent
+        self._session = None
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            import aiohttp
+
+            connector = aiohttp.TCPConnector(
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=300,
+                keepalive_timeout=30,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._session_version = None
+        return self._session
+
+    def _restore_cookies(self, client):
+        """Load the retailer session's cookies into the client's jar after a rotation or restart"""
+        if self.session is None or self._session_version == self.session.version:
+            return
+        from http.cookies import SimpleCookie
+        from yarl import URL
+
+        client.cookie_jar.clear()
+        for cookie in self.session.cookies():
+            morsel_cookie = SimpleCookie()
+            morsel_cookie[cookie['name']] = cookie['value']
+            morsel = morsel_cookie[cookie['name']]
+            domain = cookie.get('domain', '')
+            morsel['path'] = cookie.get('path', '/')
+            if domain.startswith('.'):
+                morsel['domain'] = domain
+            client.cookie_jar.update_cookies(morsel_cookie, response_url=URL(f"https://{domain.lstrip('.')}/"))
+        self._session_version = self.session.version
+
+    def _save_cookies(self, client):
+        if self.session is None:
+            return
+        cookies = []
+        for morsel in client.cookie_jar:
+            cookies.append({
+                'name': morsel.key,
+                'value': morsel.value,
+                'domain': morsel['domain'],
+                'path': morsel['path'] or '/',
+            })
+        self.session.update(cookies)
+
+    async def fetch(self, url: str) -> FetchResult:
+        try:
+            session = self._get_session()
+            self._restore_cookies(session)
+            async with session.get(url, allow_redirects=True) as response:
+                content = await response.text(errors='replace')
+            self._save_cookies(session)
+            return FetchResult(url, content, self.name, status=response.status)
+        except asyncio.TimeoutError:
+            return FetchResult(url, None, self.name, error="timeout", failure=FAILURE_TIMEOUT)
+        except Exception as e:
+            return FetchResult(url, None, self.name, error=str(e), failure=FAILURE_FETCH_ERROR)
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+class SeleniumFetchEngine(FetchEngine):
+    """Full browser fetches through the scraper's WebDriver pool"""
+    name = "selenium"
+
+    def __init__(self, scraper):
+        self.scraper = scraper
+
+    async def fetch(self, url: str) -> FetchResult:
+        async with self.scraper.browser_page():
+            return await self._fetch(url)
+
+    async def _fetch(self, url: str) -> FetchResult:
+        scraper = self.scraper
+        try:
+            pooled = await scraper.driver_pool.checkout()
+        except Exception as e:
+            return FetchResult(url, None, self.name, error=str(e), failure=classify_exception(e))
+
+        driver = pooled.driver
+        # Keep the page inside the search's time budget
+        page_load_timeout = time_left(PAGE_LOAD_TIMEOUT)
+        ready_timeout = time_left(scraper.max_ready_wait)
+
+        # Define a function to run in a separate thread
+        def fetch_with_selenium():
+            try:
+                # Start from the retailer's warm session rather than a blank cookie jar
+                restored = scraper.restore_session(pooled)
+                scraper.set_page_load_timeout(pooled, page_load_timeout)
+
+                # Visit page and return as soon as the results are in the DOM
+                started = time.monotonic()
+                with METRICS.timer('navigate', scraper.retailer_key):
+                    driver.get(url)
+                with METRICS.timer('wait_ready', scraper.retailer_key):
+                    ready = scraper.wait_until_ready(driver, ready_timeout)
+                if ready is not None:
+                    print(f"[{scraper.website}] Results ready in {time.monotonic() - started:.2f}s")
+
+                # Nudge lazy-loaded content below the first cards into view
+                driver.execute_script("window.scrollBy(0, 1500)")
+
+                # Get page source
+                with METRICS.timer('page_source', scraper.retailer_key):
+                    page_source = driver.page_source
+                scraper.save_session(pooled, restored)
+                return FetchResult(url, page_source, self.name, ready=ready is not None or not scraper.ready_selector)
+            except Exception as e:
+                print(f"Error in Selenium fetch: {str(e)}")
+                return FetchResult(url, None, self.name, error=str(e), failure=classify_exception(e))
+
+        # Execute in a thread pool, holding the driver only for this page
+        loop = asyncio.get_event_loop()
+        try:
+            result = await loop.run_in_executor(get_browser_executor(), fetch_with_selenium)
+        except BaseException:
+            # Cancelled at its deadline: drop the driver mid-navigation instead of waiting for the page
+            await scraper.driver_pool.abort(pooled)
+            raise
+        # A crashed browser is replaced rather than handed to the next search
+        await scraper.driver_pool.checkin(pooled, discard=result.failure == FAILURE_DRIVER_CRASH)
+        return result
+
+    async def close(self):
+        await self.scraper.driver_pool.close()
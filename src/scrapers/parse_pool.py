@@ -0,0 +1,53 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import importlib
+import multiprocessing
+
+from config.settings import PARSE_WORKERS
+from utils.metrics import METRICS
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+# Scraper instances built inside a worker process, reused across pages
+_worker_scrapers: Dict[Tuple[str, str, str, str], object] = {}
+
+
+def get_parse_executor() -> Optional[ProcessPoolExecutor]:
+    """Return the shared parsing process pool, or None to parse inline"""
+    global _executor
+    if PARSE_WORKERS <= 0:
+        return None
+    if _executor is None:
+        # spawn, not fork: the parent is running browser threads by now
+        _executor = ProcessPoolExecutor(
+            max_workers=PARSE_WORKERS,
+            mp_context=multiprocessing.get_context('spawn'),
+        )
+    return _executor
+
+
+def shutdown_parse_executor():
+    """Stop the parsing workers, if any were started"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+
+def parse_in_worker(module: str, class_name: str, website: str, base_url: str, method: str,
+                    *args) -> Tuple[object, List[Tuple[str, str, float]]]:
+    """Run one of a scraper's parsing methods (e.g. extract_result) in a worker process.
+
+    Page HTML in; the method's return value and the stage timings recorded
+    while running it out, so the parent can add them to its metrics. The
+    worker's scraper is parse-only: no browsers, sessions or other I/O.
+    """
+    key = (module, class_name, website, base_url)
+    scraper = _worker_scrapers.get(key)
+    if scraper is None:
+        scraper_class = getattr(importlib.import_module(module), class_name)
+        scraper = scraper_class.for_parsing(website, base_url)
+        _worker_scrapers[key] = scraper
+    with METRICS.recording() as samples:
+        value = getattr(scraper, method)(*args)
+    return value, samples
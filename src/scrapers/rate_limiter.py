@@ -0,0 +1,67 @@
+from typing import Dict, Optional
+import asyncio
+import random
+import time
+
+
+class AdaptiveRateLimiter:
+    """Token bucket shared by every fetch against one domain.
+
+    The refill rate backs off multiplicatively when the retailer shows signs
+    of throttling us and creeps back up additively while responses are
+    healthy, staying between ``min_rate`` and ``max_rate`` requests/second.
+    """
+
+    def __init__(self, name: str, rate: float, burst: int = 1, min_rate: Optional[float] = None,
+                 max_rate: Optional[float] = None, increase_step: float = 0.05):
+        self.name = name
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.min_rate = min_rate if min_rate is not None else rate / 10
+        self.max_rate = max_rate if max_rate is not None else rate * 2
+        self.increase_step = increase_step
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Wait until a request may be sent"""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+                # A little jitter keeps concurrent retailers from firing in lockstep
+                await asyncio.sleep(wait + random.uniform(0, wait * 0.1))
+
+    def record_throttled(self, reason: str, factor: float = 0.5):
+        """Slow down after a captcha page, HTTP 429/503 or an empty result page"""
+        previous = self.rate
+        self.rate = max(self.min_rate, self.rate * factor)
+        # Drop any saved-up burst so the slower rate takes effect immediately
+        self._tokens = min(self._tokens, 0.0)
+        if self.rate != previous:
+            print(f"[{self.name}] Throttling detected ({reason}), slowing to {self.rate:.2f} req/s")
+
+    def record_healthy(self):
+        """Speed back up after a healthy response"""
+        self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+
+_limiters: Dict[str, AdaptiveRateLimiter] = {}
+
+
+def get_rate_limiter(domain: str, config: Dict) -> AdaptiveRateLimiter:
+    """Return the limiter for a domain, creating it from ``config`` on first use"""
+    limiter = _limiters.get(domain)
+    if limiter is None:
+        limiter = AdaptiveRateLimiter(domain, **config)
+        _limiters[domain] = limiter
+    return limiter
@@ -0,0 +1,81 @@
+from typing import Iterable
+import asyncio
+import random
+
+# Why a search attempt failed
+FAILURE_TIMEOUT = "timeout"
+FAILURE_DRIVER_CRASH = "driver_crash"
+FAILURE_BOT_WALL = "bot_wall"
+FAILURE_PARSE_MISS = "parse_miss"
+FAILURE_FETCH_ERROR = "fetch_error"
+
+# WebDriver messages meaning the browser or its session is gone, not just the page
+DRIVER_CRASH_MARKERS = (
+    'invalid session id', 'session deleted', 'chrome not reachable', 'disconnected',
+    'no such window', 'target window already closed', 'tab crashed', 'connection refused',
+    'max retries exceeded', 'browsing context has been discarded',
+)
+
+
+class SearchFailure(Exception):
+    """A search attempt failed in a way the retry policy can classify"""
+
+    def __init__(self, kind: str, message: str = ""):
+        super().__init__(kind, message)
+        self.kind = kind
+        self.message = message
+
+    def __str__(self):
+        return self.message or self.kind
+
+
+def classify_exception(error: BaseException) -> str:
+    """Map an exception raised while fetching or parsing to a failure kind"""
+    if isinstance(error, SearchFailure):
+        return error.kind
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError)):
+        return FAILURE_TIMEOUT
+    try:
+        from selenium.common.exceptions import (
+            TimeoutException, InvalidSessionIdException, NoSuchWindowException,
+        )
+        if isinstance(error, TimeoutException):
+            return FAILURE_TIMEOUT
+        if isinstance(error, (InvalidSessionIdException, NoSuchWindowException)):
+            return FAILURE_DRIVER_CRASH
+    except ImportError:
+        pass
+    if isinstance(error, ConnectionError):
+        # The driver's HTTP endpoint is gone with its browser
+        return FAILURE_DRIVER_CRASH
+    message = str(error).lower()
+    if any(marker in message for marker in DRIVER_CRASH_MARKERS):
+        return FAILURE_DRIVER_CRASH
+    if 'timed out' in message or 'timeout' in message:
+        return FAILURE_TIMEOUT
+    return FAILURE_FETCH_ERROR
+
+
+class RetryPolicy:
+    """Which failures a retailer's searches retry, and how long to wait between attempts.
+
+    ``max_attempts`` is the budget per (product, retailer) search, first
+    attempt included. Waits use full jitter: a random delay between zero and
+    ``base_delay * 2 ** (attempt - 1)``, capped at ``max_delay``, so retries
+    from concurrent searches don't land on the retailer together.
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 1.0, max_delay: float = 20.0,
+                 retry_on: Iterable[str] = (FAILURE_TIMEOUT, FAILURE_DRIVER_CRASH, FAILURE_BOT_WALL,
+                                            FAILURE_PARSE_MISS, FAILURE_FETCH_ERROR)):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_on = frozenset(retry_on)
+
+    def should_retry(self, kind: str, attempt: int) -> bool:
+        return kind in self.retry_on and attempt < self.max_attempts
+
+    def backoff(self, attempt: int) -> float:
+        """Seconds to wait after failed attempt number ``attempt`` (1-based)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
@@ -1,123 +1,194 @@
 from .base_scraper import BaseScraper
-from bs4 import BeautifulSoup
+from .driver_pool import get_browser_executor
+from .fetch_engines import FetchResult, SeleniumFetchEngine
+from .shared_browser import exclusive
+from .retry_policy import SearchFailure, classify_exception, FAILURE_DRIVER_CRASH, FAILURE_FETCH_ERROR
+from .deadlines import time_left
+from bs4 import BeautifulSoup, SoupStrainer
+import asyncio
 import re
-from typing import Dict
+from typing import Dict, Iterator, Optional, Tuple
 from urllib.parse import quote_plus
-import asyncio
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from utils.metrics import METRICS
+from config.settings import PAGE_LOAD_TIMEOUT
+
+# TrustArc consent banner and the cookies it sets once accepted
+CONSENT_DIALOG_ID = "truste-consent-track"
+CONSENT_BUTTON_ID = "truste-consent-button"
+CONSENT_COOKIE_PREFIXES = ('notice_', 'cmapi_', 'TAconsent', 'truste')
+
 
 class SamsungScraper(BaseScraper):
+    ready_selector = ".aisearch__item"
+    results_selector = ".aisearch__item"
+    results_strainer = SoupStrainer(class_='aisearch__item')
+
     def __init__(self, base_url: str = None):
         super().__init__('Samsung', base_url)
-    
-    async def get_page_with_consent(self, url):
-        """Get page content and handle cookie consent"""
-        try:
-            # Access the driver through base_scraper's get_driver method
-            driver = await self.get_selenium_driver()
-                
-            # Load the URL
+
+    def has_consent(self) -> bool:
+        """Whether the retailer session already carries accepted consent cookies"""
+        if self.session is None:
+            return False
+        return any(cookie.get('name', '').startswith(CONSENT_COOKIE_PREFIXES) for cookie in self.session.cookies())
+
+    def accept_consent(self, driver) -> bool:
+        """Accept the consent dialog if it is showing; returns whether it was showing"""
+        # The element lookups and the click must all land in this page's tab
+        with exclusive(driver) as page_driver:
+            consent_dialogs = page_driver.find_elements(By.ID, CONSENT_DIALOG_ID)
+            if not consent_dialogs or not consent_dialogs[0].is_displayed():
+                return False
+
+            print("[Samsung] Cookie consent dialog found, accepting...")
+            # Try to find and click the "Accept All" button
+            accept_button = WebDriverWait(page_driver, 5).until(
+                EC.element_to_be_clickable((By.ID, CONSENT_BUTTON_ID))
+            )
+            accept_button.click()
+            # Wait for the dialog to disappear
+            WebDriverWait(page_driver, 5).until(EC.invisibility_of_element_located((By.ID, CONSENT_DIALOG_ID)))
+
+            # Share the consent with the other drivers straight away
+            if self.session is not None:
+                self.session.update(page_driver.get_cookies())
+        return True
+
+    def fetch_with_consent(self, pooled, url: str, page_load_timeout: float = PAGE_LOAD_TIMEOUT,
+                           ready_timeout: Optional[float] = None) -> Tuple[str, bool]:
+        """Load a search page, dealing with the consent dialog once per driver (blocking).
+
+        Returns the page source and whether the results showed up in it.
+        """
+        driver = pooled.driver
+        ready_timeout = ready_timeout or self.max_ready_wait
+        # Saved cookies, consent included, follow the retailer session into the driver
+        restored = self.restore_session(pooled)
+        self.set_page_load_timeout(pooled, page_load_timeout)
+        if not pooled.state.get('consent'):
+            pooled.state['consent'] = self.has_consent()
+
+        with METRICS.timer('navigate', self.retailer_key):
             driver.get(url)
-            
-            # Wait for initial page load
-            await asyncio.sleep(5)
-            
-            # Handle cookie consent dialog if it appears
+
+        if pooled.state['consent']:
+            # Consent was already given in this driver, skip looking for the dialog
+            with METRICS.timer('wait_ready', self.retailer_key):
+                ready = self.wait_until_ready(driver, ready_timeout)
+            if ready is None and self.accept_consent(driver):
+                # The saved consent had expired
+                with METRICS.timer('wait_ready', self.retailer_key):
+                    ready = self.wait_until_ready(driver, ready_timeout)
+        else:
+            # Wait until either the consent dialog or the results show up
+            ready = None
             try:
-                # Check if the consent dialog is present
-                consent_dialog = WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.ID, "truste-consent-track"))
-                )
-                
-                if consent_dialog.is_displayed():
-                    print("[Samsung] Cookie consent dialog found, accepting...")
-                    # Try to find and click the "Accept All" button
-                    accept_button = WebDriverWait(driver, 5).until(
-                        EC.element_to_be_clickable((By.ID, "truste-consent-button"))
-                    )
-                    accept_button.click()
-                    # Wait for the dialog to disappear
-                    await asyncio.sleep(3)
-            except (TimeoutException, NoSuchElementException) as e:
-                print(f"[Samsung] No cookie consent dialog found or error handling it: {str(e)}")
-            
-            # Wait for the page to load fully after handling consent
-            await asyncio.sleep(5)
-            
-            # Get the page content
-            page_content = driver.page_source
-            return page_content
-            
+                WebDriverWait(driver, ready_timeout, poll_frequency=0.2).until(EC.any_of(
+                    EC.presence_of_element_located((By.ID, CONSENT_DIALOG_ID)),
+                    EC.presence_of_element_located((By.CSS_SELECTOR, self.ready_selector)),
+                ))
+            except TimeoutException:
+                # Most often a search without hits; waiting on the results again would only double the wait
+                print("[Samsung] Neither consent dialog nor results appeared")
+            else:
+                try:
+                    self.accept_consent(driver)
+                    pooled.state['consent'] = True
+                except (TimeoutException, NoSuchElementException) as e:
+                    print(f"[Samsung] Error handling cookie consent dialog: {str(e)}")
+
+                # Wait for the search results after handling consent
+                with METRICS.timer('wait_ready', self.retailer_key):
+                    ready = self.wait_until_ready(driver, ready_timeout)
+
+        with METRICS.timer('page_source', self.retailer_key):
+            page_source = driver.page_source
+        self.save_session(pooled, restored)
+        return page_source, ready is not None
+
+    async def get_page_with_consent(self, url: str) -> Tuple[str, bool]:
+        """Get page content and handle cookie consent, with the browser work off the event loop"""
+        # Check a driver out of the base scraper's pool for this page
+        pooled = await self.driver_pool.checkout()
+
+        loop = asyncio.get_event_loop()
+        try:
+            page_content, ready = await loop.run_in_executor(
+                get_browser_executor(), self.fetch_with_consent, pooled, url,
+                time_left(PAGE_LOAD_TIMEOUT), time_left(self.max_ready_wait),
+            )
+        except asyncio.CancelledError:
+            # Cancelled at its deadline: drop the driver mid-navigation instead of waiting for the page
+            await self.driver_pool.abort(pooled)
+            raise
         except Exception as e:
             print(f"[Samsung] Error getting page with consent handling: {str(e)}")
-            return None
+            # A crashed browser is replaced rather than handed to the next search
+            await self.driver_pool.checkin(pooled, discard=classify_exception(e) == FAILURE_DRIVER_CRASH)
+            raise
+        await self.driver_pool.checkin(pooled)
+        return page_content, ready
 
-    async def search_product(self, product: Dict) -> Dict:
-        try:
-            # Format search query
-            search_query = product['name'].replace('"', '').replace('"', '')
-            search_url = f"{self.base_url}/ca/search/?searchvalue={quote_plus(search_query)}"
-            
-            print(f"[Samsung] Searching URL: {search_url}")
-            
-            # Get page with custom method that handles consent
-            page_content = await self.get_page_with_consent(search_url)
-            
-            if not page_content:
-                print("[Samsung] No page content returned")
-                return self.format_result(product, "", None)
-            
-            soup = BeautifulSoup(page_content, 'html.parser')
-            
-            # Look for Samsung search results
-            product_items = soup.select('.aisearch__item')
-            print(f"[Samsung] Found {len(product_items)} products in search results")
-            
-            if not product_items:
-                print("[Samsung] No products found in search results")
-                return self.format_result(product, "", None)
-
-            # Process the found products
-            for product_item in product_items[:5]:
-                try:
-                    # Extract product name
-                    name_element = product_item.select_one('.aisearch-product__name')
-                    if not name_element:
-                        continue
-                    title = name_element.text.strip()
-                    print(f"[Samsung] Found product: {title}")
-                    
-                    # Extract price
-                    price = None
-                    price_element = product_item.select_one('.aisearch-product__price-save')
-                    if price_element:
-                        price_text = price_element.text.strip()
-                        price_match = re.search(r'\$?[\d,]+\.\d+', price_text)
-                        if price_match:
-                            price_str = price_match.group().replace('$', '').replace(',', '')
-                            try:
-                                price = float(price_str)
-                                print(f"[Samsung] Found price: ${price}")
-                            except ValueError:
-                                pass
-                    
-                    if not price:
-                        print(f"[Samsung] No price found for: {title}")
-                        continue
-                    
-                    print(f"[Samsung] Returning result: {title}, ${price}")
-                    return self.format_result(product, title, price, "")
-                    
-                except Exception as e:
-                    print(f"[Samsung] Error processing product: {str(e)}")
+    async def fetch_page(self, url: str) -> str:
+        """Samsung pages always go through the browser to deal with the consent dialog"""
+        await self.rate_limiter.acquire()
+        async with self.browser_page():
+            page_content, ready = await self.get_page_with_consent(url)
+        if not page_content:
+            raise SearchFailure(FAILURE_FETCH_ERROR, "empty page source")
+        result = FetchResult(url, page_content, SeleniumFetchEngine.name, ready=ready)
+        self.record_response(result, self.needs_browser(result))
+        return page_content
+
+    def build_search_url(self, product: Dict) -> str:
+        # Format search query
+        search_query = product['name'].replace('"', '').replace('"', '')
+        return f"{self.base_url}/ca/search/?searchvalue={quote_plus(search_query)}"
+
+    def iter_candidates(self, soup: BeautifulSoup) -> Iterator[Tuple[str, float]]:
+        # Look for Samsung search results
+        product_items = soup.select('.aisearch__item')
+        print(f"[Samsung] Found {len(product_items)} products in search results")
+
+        if not product_items:
+            print("[Samsung] No products found in search results")
+            return
+
+        # Process the found products
+        for product_item in product_items[:self.max_candidates]:
+            try:
+                # Extract product name
+                name_element = product_item.select_one('.aisearch-product__name')
+                if not name_element:
+                    continue
+                title = name_element.text.strip()
+                print(f"[Samsung] Found product: {title}")
+                
+                # Extract price
+                price = None
+                price_element = product_item.select_one('.aisearch-product__price-save')
+                if price_element:
+                    price_text = price_element.text.strip()
+                    price_match = re.search(r'\$?[\d,]+\.\d+', price_text)
+                    if price_match:
+                        price_str = price_match.group().replace('$', '').replace(',', '')
+                        try:
+                            price = float(price_str)
+                            print(f"[Samsung] Found price: ${price}")
+                        except ValueError:
+                            pass
+                
+                if not price:
+                    print(f"[Samsung] No price found for: {title}")
                     continue
-            
-            print("[Samsung] No valid products found after processing")
-            return self.format_result(product, "", None)
+                
+            except Exception as e:
+                print(f"[Samsung] Error processing product: {str(e)}")
+                continue
 
-        except Exception as e:
-            print(f"[Samsung] Error: {str(e)}")
-            return self.format_result(product, "", None) 
\ No newline at end of file
+            print(f"[Samsung] Returning result: {title}, ${price}")
+            yield title, price
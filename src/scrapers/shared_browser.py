@@ -0,0 +1,214 @@
+from contextlib import contextmanager
+from typing import List, Optional
+import os
+import threading
+import time
+
+from .resource_blocking import apply_chrome_blocking
+from config.settings import RESOURCE_BLOCKING_ENABLED
+
+
+class BrowserTab:
+    """One tab of a shared browser, usable wherever a pooled WebDriver is expected.
+
+    Every WebDriver call switches the browser to this tab under the browser's
+    lock first. Navigation doesn't hold the lock while the page loads (the
+    browser runs with the "none" page load strategy), so tabs for different
+    retailers load in parallel. Use ``exclusive()`` to keep the tab active
+    across several calls, e.g. finding an element and then clicking it.
+    """
+
+    def __init__(self, process: 'BrowserProcess', handle: str):
+        self._process = process
+        self.handle = handle
+        self.page_load_timeout = process.page_load_timeout
+
+    @contextmanager
+    def exclusive(self):
+        with self._process.lock:
+            self._process.activate(self.handle)
+            yield self._process.driver
+
+    def __getattr__(self, name):
+        with self.exclusive() as driver:
+            value = getattr(driver, name)
+        if not callable(value):
+            return value
+
+        def call(*args, **kwargs):
+            with self.exclusive() as driver:
+                return getattr(driver, name)(*args, **kwargs)
+        return call
+
+    def set_page_load_timeout(self, seconds: float):
+        """Per tab, since loads are polled here rather than timed by the browser"""
+        self.page_load_timeout = seconds
+
+    def get(self, url: str):
+        """Navigate and wait for the new document to be parsed, without holding the browser"""
+        with self.exclusive() as driver:
+            # Blank the old page and mark its window so stale results can't
+            # satisfy a readiness check before the new document commits
+            driver.execute_script(
+                "window.__previousPage = true;"
+                "document.documentElement.innerHTML = '';"
+                "window.location.href = arguments[0];",
+                url,
+            )
+
+        from selenium.common.exceptions import TimeoutException, WebDriverException, NoSuchWindowException
+
+        deadline = time.monotonic() + self.page_load_timeout
+        while time.monotonic() < deadline:
+            time.sleep(0.1)
+            if self.handle not in self._process.tabs:
+                # The tab was closed under us, e.g. its search was cancelled
+                raise NoSuchWindowException(f"Tab closed while loading {url}")
+            try:
+                with self.exclusive() as driver:
+                    if driver.execute_script("return !window.__previousPage && document.readyState !== 'loading'"):
+                        return
+            except WebDriverException:
+                # The document is being swapped out under us; try again
+                continue
+        raise TimeoutException(f"Timed out loading {url}")
+
+    def quit(self):
+        """Close just this tab; the browser keeps serving the others"""
+        self._process.close_tab(self.handle)
+
+
+@contextmanager
+def exclusive(driver):
+    """Keep a shared-browser tab active across several calls; other drivers pass straight through"""
+    if isinstance(driver, BrowserTab):
+        with driver.exclusive() as tab_driver:
+            yield tab_driver
+    else:
+        yield driver
+
+
+class BrowserProcess:
+    """A single Chrome process whose tabs are shared out to the retailers"""
+
+    def __init__(self, profile_dir: str, page_load_timeout: float = 30):
+        self.profile_dir = profile_dir
+        self.page_load_timeout = page_load_timeout
+        self.lock = threading.RLock()
+        self.driver = None
+        self.tabs: List[str] = []
+        self._home: Optional[str] = None
+        self._active: Optional[str] = None
+
+    def _launch(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+
+        os.makedirs(self.profile_dir, exist_ok=True)
+        options = Options()
+        options.add_argument("--headless")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        # Reuse the profile from earlier runs: its disk cache and compiled code are already warm
+        options.add_argument(f"--user-data-dir={os.path.abspath(self.profile_dir)}")
+        # Tabs poll their own readiness so one slow page never blocks the others
+        options.page_load_strategy = "none"
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+
+        started = time.monotonic()
+        self.driver = webdriver.Chrome(options=options)
+        # The first window is never handed out, so closing the last tab never ends the session
+        self._home = self._active = self.driver.current_window_handle
+        self.tabs = []
+        print(f"Shared browser started in {time.monotonic() - started:.2f}s ({self.profile_dir})")
+
+    def _alive(self) -> bool:
+        if self.driver is None:
+            return False
+        try:
+            self.driver.window_handles
+            return True
+        except Exception:
+            return False
+
+    def start(self):
+        with self.lock:
+            if not self._alive():
+                self._launch()
+
+    def activate(self, handle: str):
+        if self._active != handle:
+            self.driver.switch_to.window(handle)
+            self._active = handle
+
+    def open_tab(self, retailer_key: str, user_agent: Optional[str] = None) -> BrowserTab:
+        """Open a new tab set up for a retailer (blocking, called from a worker thread)"""
+        with self.lock:
+            if not self._alive():
+                print("Shared browser is gone, restarting it")
+                self._launch()
+            self.driver.switch_to.new_window('tab')
+            handle = self._active = self.driver.current_window_handle
+            self.tabs.append(handle)
+
+            # DevTools settings apply to the tab they're sent to
+            if user_agent:
+                self.driver.execute_cdp_cmd('Network.setUserAgentOverride', {'userAgent': user_agent})
+            if RESOURCE_BLOCKING_ENABLED:
+                apply_chrome_blocking(self.driver, retailer_key)
+            return BrowserTab(self, handle)
+
+    def close_tab(self, handle: str):
+        with self.lock:
+            if handle not in self.tabs:
+                return
+            self.tabs.remove(handle)
+            try:
+                self.activate(handle)
+                self.driver.close()
+            finally:
+                self._active = None
+                if self._home is not None and self._alive():
+                    self.activate(self._home)
+
+    def quit(self):
+        with self.lock:
+            if self.driver is not None:
+                try:
+                    self.driver.quit()
+                except Exception as e:
+                    print(f"Error closing shared browser: {str(e)}")
+            self.driver = None
+            self.tabs = []
+
+
+class SharedBrowser:
+    """A small fixed number of Chrome processes serving every retailer through tabs.
+
+    Each retailer's driver pool opens tabs here instead of starting its own
+    browser. Retailers live on different domains, so their cookies stay
+    separate even though tabs share a profile.
+    """
+
+    def __init__(self, processes: int, profile_dir: str, page_load_timeout: float = 30):
+        self.processes = [
+            BrowserProcess(os.path.join(profile_dir, f"browser-{index}"), page_load_timeout)
+            for index in range(max(1, processes))
+        ]
+
+    def start(self):
+        """Start every browser process up front (blocking)"""
+        for process in self.processes:
+            try:
+                process.start()
+            except Exception as e:
+                print(f"Could not start shared browser: {str(e)}")
+
+    def open_tab(self, retailer_key: str, user_agent: Optional[str] = None) -> BrowserTab:
+        # Spread tabs over the processes
+        process = min(self.processes, key=lambda process: len(process.tabs))
+        return process.open_tab(retailer_key, user_agent)
+
+    def close(self):
+        for process in self.processes:
+            process.quit()
@@ -1,38 +1,29 @@
 from .base_scraper import BaseScraper
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import re
-from typing import Dict
-import time
+from typing import Dict, Iterator, Tuple
 from urllib.parse import quote_plus
-import asyncio
 
 class StaplesScraper(BaseScraper):
+    ready_selector = ".product-thumbnail.ais-hit"
+    results_selector = ".product-thumbnail.ais-hit"
+    results_strainer = SoupStrainer(class_='ais-hit')
+
     def __init__(self, base_url: str):
         super().__init__('Staples', base_url)
 
+    def build_search_url(self, product: Dict) -> str:
+        return f"{self.base_url}/search?query={quote_plus(product['name'])}"
+
+    def iter_candidates(self, soup: BeautifulSoup) -> Iterator[Tuple[str, float]]:
+        """Yield the top products in the Staples search results"""
+        product_divs = soup.select('.product-thumbnail.h-100.ais-hit')
 
-    async def search_product(self, product: Dict) -> Dict:
-        """Search for a product on Staples and return the first result"""
-        try:
-            search_url = f"{self.base_url}/search?query={quote_plus(product['name'])}"
-            print(f"Searching Staples: {search_url}")
-            
-            # Get the page content using Selenium
-            page_content = await self.get_page(search_url)
-            if not page_content:
-                print("Failed to retrieve Staples search page")
-                return self.format_result(product, "", None)
-            
-            # Parse the HTML content
-            soup = BeautifulSoup(page_content, 'html.parser')
-            
-            # Find the first product in the search results
-            product_div = soup.select_one('.product-thumbnail.h-100.ais-hit')
-            
-            if not product_div:
-                print("No product found on Staples")
-                return self.format_result(product, "", None)
+        if not product_divs:
+            print("No product found on Staples")
+            return
 
+        for product_div in product_divs[:self.max_candidates]:
             # Extract title
             title_element = product_div.select_one('.product-thumbnail__title.product-link')
             title = title_element.text.strip() if title_element else ""
@@ -45,10 +36,7 @@ class StaplesScraper(BaseScraper):
                 price_match = re.search(r'[\d,]+\.\d+', price_text)
                 if price_match:
                     price = float(price_match.group().replace(',', ''))
-            
-            print(f"Staples result: {title}, {price}")
-            return self.format_result(product, title, price, "")
 
-        except Exception as e:
-            print(f"Error scraping Staples: {str(e)}")
-            return self.format_result(product, "", None) 
\ No newline at end of file
+            print(f"Staples result: {title}, {price}")
+            if title:
+                yield title, price
@@ -0,0 +1,98 @@
+import glob
+import json
+import os
+import zlib
+from typing import Dict, List, Tuple
+
+from utils.helpers import extract_model_number, normalize_model_number
+from utils.results import merge_indexed_results
+
+SHARD_BY_MODEL = 'model'
+SHARD_BY_RETAILER = 'retailer'
+
+
+def shard_for_product(product: Dict, shard_count: int) -> int:
+    """Stable shard for a product, from a hash of its normalized model number.
+
+    Uses crc32 rather than hash() so every process and host agrees, and so
+    duplicate queries for the same model land on the same shard.
+    """
+    key = normalize_model_number(extract_model_number(product['name']))
+    return zlib.crc32(key.encode('utf-8')) % shard_count
+
+
+def partition_products(products: List[Dict], shard_count: int) -> List[List[Tuple[int, Dict]]]:
+    """Split products into shards by model number, keeping each product's input index"""
+    shards: List[List[Tuple[int, Dict]]] = [[] for _ in range(shard_count)]
+    for index, product in enumerate(products):
+        shards[shard_for_product(product, shard_count)].append((index, product))
+    return shards
+
+
+def partition_retailers(retailers: List[str], shard_count: int) -> List[List[str]]:
+    """Split retailers round-robin across shards.
+
+    Every shard gets at least one retailer, so there can't be more shards
+    than retailers.
+    """
+    if shard_count > len(retailers):
+        raise ValueError(f"Cannot split {len(retailers)} retailers across {shard_count} shards")
+    return [retailers[i::shard_count] for i in range(shard_count)]
+
+
+def shard_output_path(output_dir: str, shard_index: int) -> str:
+    return os.path.join(output_dir, f"shard-{shard_index:03d}.json")
+
+
+def clear_shard_outputs(output_dir: str):
+    """Remove shard outputs left over from a previous run"""
+    for path in glob.glob(os.path.join(output_dir, 'shard-*.json')):
+        os.remove(path)
+
+
+def write_shard_output(output_dir: str, shard_index: int, shard_count: int, shard_by: str,
+                       indexed_results: List[Tuple[int, Dict]]):
+    """Write one shard's per-product results, atomically so a coordinator never reads half a file"""
+    os.makedirs(output_dir, exist_ok=True)
+    path = shard_output_path(output_dir, shard_index)
+    payload = {
+        "ShardIndex": shard_index,
+        "ShardCount": shard_count,
+        "ShardBy": shard_by,
+        "Results": [
+            {"Index": index, "Brand": result.get("Brand"), "Product": result.get("Product", [])}
+            for index, result in indexed_results
+        ],
+    }
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def merge_shard_outputs(output_dir: str, retailer_order: List[str]) -> List[Dict]:
+    """Combine every shard's output into the brand-grouped structure of a single run.
+
+    Results are put back in input order, and when shards split by retailer
+    each product's results are re-assembled in ``retailer_order`` (retailer
+    keys like 'bestbuy') so the output matches an unsharded run.
+    """
+    paths = sorted(glob.glob(os.path.join(output_dir, 'shard-*.json')))
+    if not paths:
+        raise Exception(f"No shard outputs found in {output_dir}")
+
+    shard_count = None
+    seen_shards = set()
+    indexed_results = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            payload = json.load(f)
+        shard_count = payload["ShardCount"]
+        seen_shards.add(payload["ShardIndex"])
+        indexed_results.extend((record["Index"], record) for record in payload["Results"])
+
+    missing = set(range(shard_count)) - seen_shards
+    if missing:
+        print(f"Warning: missing output for shards {sorted(missing)}, merging partial results")
+
+    return merge_indexed_results(indexed_results, retailer_order)
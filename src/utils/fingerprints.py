@@ -0,0 +1,106 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from bs4 import SoupStrainer
+
+from .html_parsing import make_soup
+
+# Scripts, styles and comments carry per-request nonces and tracking ids
+VOLATILE_RE = re.compile(r'<script\b.*?</script>|<style\b.*?</style>|<!--.*?-->', re.IGNORECASE | re.DOTALL)
+TAG_RE = re.compile(r'<[^>]+>')
+SPACE_RE = re.compile(r'\s+')
+
+
+def fingerprint_text(text: str) -> str:
+    return hashlib.blake2b(SPACE_RE.sub(' ', text).strip().encode('utf-8', 'replace'), digest_size=16).hexdigest()
+
+
+def fingerprint_results(page_content: str, selector: str = "", strainer: Optional[SoupStrainer] = None) -> str:
+    """Hash the visible text of a search page's result cards.
+
+    Only text is hashed so tracking attributes and markup churn don't count
+    as a change. The cards are cut out with selectolax, or with lxml and the
+    scraper's SoupStrainer when selectolax isn't installed. Only when the
+    cards aren't found is the visible text of the whole page used instead.
+    """
+    if selector:
+        try:
+            from selectolax.parser import HTMLParser
+
+            nodes = HTMLParser(page_content).css(selector)
+            texts = [node.text(separator=' ') for node in nodes]
+        except ImportError:
+            nodes = make_soup(page_content, strainer).select(selector)
+            texts = [node.get_text(' ') for node in nodes]
+        if texts:
+            return fingerprint_text(' '.join(texts))
+    return fingerprint_text(TAG_RE.sub(' ', VOLATILE_RE.sub(' ', page_content)))
+
+
+class FingerprintStore:
+    """Last results-fragment fingerprint and result per (retailer, product), kept across runs.
+
+    With ``compare=False`` nothing is reported as unchanged, but fingerprints
+    are still recorded for the next run. Writes are buffered and upserted in
+    one short transaction every ``commit_every`` results, so shard processes
+    sharing the database never wait on each other's open write lock.
+    """
+
+    def __init__(self, path: str, compare: bool = True, commit_every: int = 50):
+        self.path = path
+        self.compare = compare
+        self.commit_every = commit_every
+        self.unchanged = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS fingerprints ("
+            "retailer TEXT NOT NULL, product TEXT NOT NULL, fingerprint TEXT NOT NULL, "
+            "result TEXT NOT NULL, updated_at TEXT NOT NULL, PRIMARY KEY (retailer, product))"
+        )
+        self._pending: List[tuple] = []
+
+    def get(self, retailer: str, product: str) -> Optional[Tuple[str, Dict]]:
+        """Return (fingerprint, result) from the last run, if any"""
+        if not self.compare:
+            return None
+        row = self._conn.execute(
+            "SELECT fingerprint, result FROM fingerprints WHERE retailer = ? AND product = ?",
+            (retailer, product),
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def put(self, retailer: str, product: str, fingerprint: str, result: Dict):
+        self._pending.append((retailer, product, fingerprint, json.dumps(result, ensure_ascii=False),
+                              datetime.now().isoformat(timespec='seconds')))
+        if len(self._pending) >= self.commit_every:
+            self.commit()
+
+    def commit(self):
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+        # The write lock is only held for this one statement's transaction
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO fingerprints (retailer, product, fingerprint, result, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def close(self):
+        if self._conn is None:
+            return
+        self.commit()
+        self._conn.close()
+        self._conn = None
@@ -1,6 +1,18 @@
 import re
 from typing import Optional
 
+# Lower-cased snippets that only show up on captcha / bot-check pages
+BOT_WALL_MARKERS = [
+    'validatecaptcha',
+    'px-captcha',
+    'captcha-delivery',
+    'robot check',
+    'are you a human',
+    'unusual traffic',
+    'access denied',
+    '_incapsula_resource',
+]
+
 def clean_price(price_str: str) -> Optional[float]:
     """Convert price string to float"""
     try:
@@ -14,6 +26,20 @@ def normalize_model_number(model: str) -> str:
     """Normalize model number for comparison"""
     return re.sub(r'[^A-Z0-9]', '', model.upper())
 
+def extract_model_number(product_name: str) -> str:
+    """Pull the model number out of a product name like 'Hisense 50" ... - 50A68N'"""
+    # Model numbers mix letters and digits; take the last such token so
+    # series names earlier in the title (e.g. 'QN85D') lose to the full model
+    tokens = re.findall(r'[A-Za-z0-9]+', product_name)
+    for token in reversed(tokens):
+        if len(token) >= 5 and re.search(r'[A-Za-z]', token) and re.search(r'\d', token):
+            return token.upper()
+    return product_name
+
+def title_has_model(title: str, model: str) -> bool:
+    """Check whether a normalized model number appears in a product title"""
+    return bool(model) and model in normalize_model_number(title)
+
 def calculate_similarity(str1: str, str2: str) -> float:
     """Calculate similarity between two strings"""
     str1 = str1.lower()
@@ -26,4 +52,11 @@ def calculate_similarity(str1: str, str2: str) -> float:
     intersection = words1.intersection(words2)
     union = words1.union(words2)
     
-    return len(intersection) / len(union) if union else 0 
\ No newline at end of file
+    return len(intersection) / len(union) if union else 0 
+
+def is_bot_wall(page_content: str) -> bool:
+    """Detect captcha, robot-check and access-denied pages"""
+    if not page_content:
+        return False
+    content = page_content.lower()
+    return any(marker in content for marker in BOT_WALL_MARKERS)
@@ -0,0 +1,62 @@
+from typing import Optional
+from bs4 import BeautifulSoup, SoupStrainer
+
+from config.settings import HTML_PARSER
+
+_warned = set()
+
+
+def _warn_once(message: str):
+    if message not in _warned:
+        _warned.add(message)
+        print(message)
+
+
+def soup_backend(parser: str = HTML_PARSER) -> str:
+    """Return the BeautifulSoup tree builder to use, falling back to html.parser"""
+    if parser in ('lxml', 'selectolax'):
+        try:
+            import lxml  # noqa: F401
+            return 'lxml'
+        except ImportError:
+            if parser == 'lxml':
+                _warn_once("lxml is not installed, falling back to html.parser")
+    return 'html.parser'
+
+
+def slice_fragments(page_content: str, selector: str) -> Optional[str]:
+    """Cut the nodes matching a CSS selector out of a page with selectolax.
+
+    Returns the concatenated outer HTML of the matches, or None when
+    selectolax is unavailable or nothing matched.
+    """
+    try:
+        from selectolax.parser import HTMLParser
+    except ImportError:
+        _warn_once("selectolax is not installed, parsing full pages instead")
+        return None
+
+    nodes = HTMLParser(page_content).css(selector)
+    if not nodes:
+        return None
+    return ''.join(node.html for node in nodes)
+
+
+def make_soup(page_content: str, strainer: Optional[SoupStrainer] = None,
+              slice_selector: str = "", parser: str = HTML_PARSER) -> BeautifulSoup:
+    """Parse a page, restricted to the results container when possible.
+
+    With the selectolax backend the matches for ``slice_selector`` are cut out
+    of the page first and only that fragment is handed to BeautifulSoup.
+    Otherwise ``strainer`` limits the tree to the matching tags while parsing.
+    """
+    backend = soup_backend(parser)
+
+    if parser == 'selectolax' and slice_selector:
+        fragment = slice_fragments(page_content, slice_selector)
+        if fragment is not None:
+            return BeautifulSoup(fragment, backend)
+
+    if strainer is not None:
+        return BeautifulSoup(page_content, backend, parse_only=strainer)
+    return BeautifulSoup(page_content, backend)
@@ -0,0 +1,110 @@
+import re
+import zlib
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.settings import MATCH_FEATURES, MATCH_BATCH_SIZE
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+@lru_cache(maxsize=200_000)
+def _title_features(title: str, n_features: int, ngram_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Hashed word and character n-gram counts for a title, cached per title"""
+    features = []
+    for token in TOKEN_RE.findall(title.lower()):
+        features.append('w:' + token)
+        padded = f' {token} '
+        for i in range(max(1, len(padded) - ngram_size + 1)):
+            features.append('c:' + padded[i:i + ngram_size])
+    # crc32 rather than hash() so vectors agree across processes and runs
+    hashed = np.fromiter((zlib.crc32(feature.encode()) % n_features for feature in features),
+                         dtype=np.int64, count=len(features))
+    return np.unique(hashed, return_counts=True)
+
+
+class CatalogMatcher:
+    """Batched fuzzy matching of listing titles against a product catalog.
+
+    Titles become TF-IDF weighted vectors of hashed words and character
+    n-grams (the IDF fitted on the catalog), L2-normalized, so a block of
+    listings is scored against the whole catalog with one matrix product.
+    """
+
+    def __init__(self, catalog: List[str], n_features: int = MATCH_FEATURES, ngram_size: int = 3):
+        self.catalog = list(catalog)
+        self.n_features = n_features
+        self.ngram_size = ngram_size
+
+        counts = self._counts(self.catalog)
+        document_frequency = np.count_nonzero(counts, axis=0)
+        self.idf = (np.log((1 + len(self.catalog)) / (1 + document_frequency)) + 1).astype(np.float32)
+        # Features no catalog title has can't contribute to a score, so the
+        # matrix products only run over the columns the catalog uses
+        self.columns = np.flatnonzero(document_frequency)
+        self.catalog_vectors = np.ascontiguousarray(self._normalize(counts * self.idf)[:, self.columns])
+
+    def _counts(self, titles: List[str]) -> np.ndarray:
+        counts = np.zeros((len(titles), self.n_features), dtype=np.float32)
+        for row, title in enumerate(titles):
+            indices, values = _title_features(title or "", self.n_features, self.ngram_size)
+            counts[row, indices] = values
+        return counts
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        return vectors / norms
+
+    def vectorize(self, titles: List[str]) -> np.ndarray:
+        """TF-IDF vectors for titles over the catalog's columns, comparable with ``catalog_vectors``"""
+        # Normalize over every feature first so words the catalog lacks still count against a listing
+        return self._normalize(self._counts(titles) * self.idf)[:, self.columns]
+
+    def top_k(self, titles: List[str], k: int = 1, batch_size: int = MATCH_BATCH_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (catalog indices, cosine scores) of the k best catalog entries per title, best first"""
+        k = min(k, len(self.catalog))
+        indices = np.zeros((len(titles), k), dtype=np.int64)
+        scores = np.zeros((len(titles), k), dtype=np.float32)
+        if k == 0:
+            return indices, scores
+
+        for start in range(0, len(titles), batch_size):
+            block = self.vectorize(titles[start:start + batch_size]) @ self.catalog_vectors.T
+            if k < block.shape[1]:
+                best = np.argpartition(-block, k - 1, axis=1)[:, :k]
+            else:
+                best = np.tile(np.arange(block.shape[1]), (block.shape[0], 1))
+            best_scores = np.take_along_axis(block, best, axis=1)
+            order = np.argsort(-best_scores, axis=1)
+            indices[start:start + len(block)] = np.take_along_axis(best, order, axis=1)
+            scores[start:start + len(block)] = np.take_along_axis(best_scores, order, axis=1)
+        return indices, scores
+
+    def match(self, listings: pd.DataFrame, title_column: str = 'Title', k: int = 1,
+              min_score: Optional[float] = None) -> pd.DataFrame:
+        """Match every listing against the catalog in one pass.
+
+        Returns the listings joined with their top-k catalog matches
+        (``ListingIndex``, ``Product``, ``ProductIndex``, ``Score``, ``Rank``), dropping matches
+        below ``min_score``.
+        """
+        titles = listings[title_column].fillna("").astype(str).tolist()
+        indices, scores = self.top_k(titles, k)
+
+        matches = pd.DataFrame({
+            'ListingIndex': np.repeat(np.arange(len(titles)), indices.shape[1]),
+            'ProductIndex': indices.ravel(),
+            'Score': scores.ravel(),
+            'Rank': np.tile(np.arange(1, indices.shape[1] + 1), len(titles)),
+        })
+        if min_score is not None:
+            matches = matches[matches['Score'] >= min_score]
+        matches['Product'] = [self.catalog[index] for index in matches['ProductIndex']]
+
+        listings = listings.reset_index(drop=True)
+        return matches.join(listings, on='ListingIndex')
@@ -0,0 +1,182 @@
+import bisect
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+# Upper bounds (seconds) of the latency histogram buckets
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+
+# Hot-path stages, in the order they appear in the summary table
+STAGES = ['driver_start', 'http_fetch', 'navigate', 'wait_ready', 'page_source',
+          'parse', 'extract', 'search', 'merge']
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram, as Prometheus expects"""
+
+    def __init__(self, buckets: Tuple[float, ...] = BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        """Approximate quantile: the upper bound of the bucket holding it"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+
+class Metrics:
+    """Per-retailer stage latencies and search outcome counters for one process.
+
+    Thread safe, since browser work is timed inside executor threads.
+    Parsing workers record into a ``recording()`` block and ship the samples
+    back to the parent with their result.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms: Dict[Tuple[str, str], Histogram] = {}
+        self.counters: Dict[Tuple[str, str, str], int] = defaultdict(int)
+        self._local = threading.local()
+
+    def observe(self, stage: str, retailer: str, seconds: float):
+        with self._lock:
+            histogram = self.histograms.get((stage, retailer))
+            if histogram is None:
+                histogram = self.histograms[(stage, retailer)] = Histogram()
+            histogram.observe(seconds)
+        samples = getattr(self._local, 'samples', None)
+        if samples is not None:
+            samples.append((stage, retailer, seconds))
+
+    def increment(self, name: str, retailer: str, label: str, amount: int = 1):
+        """Bump a counter such as ('searches', 'costco', 'ok')"""
+        with self._lock:
+            self.counters[(name, retailer, label)] += amount
+
+    @contextmanager
+    def timer(self, stage: str, retailer: str):
+        """Time a ``with`` block as one observation of ``stage``"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, retailer, time.perf_counter() - start)
+
+    @contextmanager
+    def recording(self):
+        """Collect the observations made in this thread during a ``with`` block"""
+        samples: List[Tuple[str, str, float]] = []
+        self._local.samples = samples
+        try:
+            yield samples
+        finally:
+            self._local.samples = None
+
+    def replay(self, samples: List[Tuple[str, str, float]]):
+        """Record observations made in another process"""
+        for stage, retailer, seconds in samples:
+            self.observe(stage, retailer, seconds)
+
+    def to_prometheus(self) -> str:
+        """Render everything in the Prometheus text exposition format"""
+        with self._lock:
+            histograms = sorted(self.histograms.items())
+            counters = sorted(self.counters.items())
+
+        lines = [
+            '# HELP price_scraper_stage_seconds Time spent in each hot-path stage',
+            '# TYPE price_scraper_stage_seconds histogram',
+        ]
+        for (stage, retailer), histogram in histograms:
+            labels = f'stage="{stage}",retailer="{retailer}"'
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f'price_scraper_stage_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'price_scraper_stage_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f'price_scraper_stage_seconds_sum{{{labels}}} {histogram.sum:.6f}')
+            lines.append(f'price_scraper_stage_seconds_count{{{labels}}} {histogram.count}')
+
+        names = sorted({key[0] for key, _ in counters})
+        for name in names:
+            lines.append(f'# TYPE price_scraper_{name}_total counter')
+            for (counter_name, retailer, label), value in counters:
+                if counter_name == name:
+                    lines.append(f'price_scraper_{name}_total{{retailer="{retailer}",outcome="{label}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str):
+        """Write the text format to a file, e.g. for node_exporter's textfile collector"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+
+    def summary_table(self, outcomes: Optional[List[str]] = None) -> str:
+        """Per-retailer search outcomes and mean / p95 stage latencies as a text table"""
+        with self._lock:
+            histograms = dict(self.histograms)
+            counters = dict(self.counters)
+
+        retailers = sorted({retailer for _, retailer in histograms} |
+                           {retailer for (_, retailer, _) in counters})
+        if outcomes is None:
+            outcomes = sorted({label for (name, _, label) in counters if name == 'searches'})
+        stages = [stage for stage in STAGES if any((stage, retailer) in histograms for retailer in retailers)]
+
+        header = ['retailer'] + outcomes + [f'{stage} mean/p95' for stage in stages]
+        rows = [header]
+        for retailer in retailers:
+            row = [retailer] + [str(counters.get(('searches', retailer, outcome), 0)) for outcome in outcomes]
+            for stage in stages:
+                histogram = histograms.get((stage, retailer))
+                if histogram is None or not histogram.count:
+                    row.append('-')
+                else:
+                    row.append(f"{histogram.sum / histogram.count:.3f}/{histogram.quantile(0.95):.3f}s")
+            rows.append(row)
+
+        widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+        return '\n'.join('  '.join(cell.ljust(width) for cell, width in zip(row, widths)) for row in rows)
+
+
+async def start_metrics_server(metrics: Metrics, port: int):
+    """Serve ``/metrics`` over HTTP for Prometheus to scrape; returns the runner to clean up"""
+    from aiohttp import web
+
+    async def handle(request):
+        return web.Response(text=metrics.to_prometheus(), content_type='text/plain', charset='utf-8')
+
+    app = web.Application()
+    app.router.add_get('/metrics', handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, port=port).start()
+    print(f"Serving metrics on http://localhost:{port}/metrics")
+    return runner
+
+
+# Process-wide registry used by the scrapers
+METRICS = Metrics()
@@ -0,0 +1,107 @@
+import gzip
+import hashlib
+import os
+import time
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a search URL so equivalent queries share a cache entry"""
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (key, ' '.join(value.split()).lower())
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+    )
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ''))
+
+
+class PageCache:
+    """Content-addressed on-disk cache of fetched search pages.
+
+    Pages are stored gzip-compressed under a hash of (retailer, normalized
+    URL). Entries older than ``ttl`` seconds are ignored unless the cache is in
+    replay mode, and the least recently used entries are evicted once the
+    cache grows past ``max_bytes``.
+    """
+
+    def __init__(self, cache_dir: str, ttl: float = 3600, max_bytes: int = 500 * 1024 * 1024,
+                 replay: bool = False):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.replay = replay
+        self.hits = 0
+        self.misses = 0
+        self._total_bytes = None
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(retailer: str, url: str) -> str:
+        return hashlib.sha256(f"{retailer}\n{normalize_url(url)}".encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.html.gz")
+
+    def get(self, retailer: str, url: str) -> Optional[str]:
+        """Return the cached page, or None if it is missing or expired"""
+        path = self._path(self.key(retailer, url))
+        try:
+            stat = os.stat(path)
+            if not self.replay and time.time() - stat.st_mtime > self.ttl:
+                self.misses += 1
+                return None
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                content = f.read()
+            # Record the access time for LRU eviction, keeping mtime as the fetch time
+            os.utime(path, (time.time(), stat.st_mtime))
+        except (OSError, EOFError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return content
+
+    def put(self, retailer: str, url: str, content: str):
+        """Store a page, evicting old entries if the cache is over its size bound"""
+        path = self._path(self.key(retailer, url))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        previous_size = os.path.getsize(path) if os.path.exists(path) else 0
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=6) as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+        if self._total_bytes is not None:
+            self._total_bytes += os.path.getsize(path) - previous_size
+        self.evict()
+
+    def _entries(self):
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith('.html.gz'):
+                    path = os.path.join(root, name)
+                    try:
+                        yield path, os.stat(path)
+                    except OSError:
+                        continue
+
+    def evict(self):
+        """Drop least recently used pages until the cache fits in max_bytes"""
+        if self._total_bytes is None:
+            self._total_bytes = sum(stat.st_size for _, stat in self._entries())
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        # Evict down to 90% so we don't rescan the directory on every put
+        target = self.max_bytes * 0.9
+        for path, stat in sorted(self._entries(), key=lambda entry: entry[1].st_atime):
+            if self._total_bytes <= target:
+                break
+            try:
+                os.remove(path)
+                self._total_bytes -= stat.st_size
+            except OSError:
+                continue
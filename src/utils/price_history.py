@@ -0,0 +1,118 @@
+import os
+import sqlite3
+from typing import Dict, List, Optional
+
+from .helpers import clean_price
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS prices (
+    retailer TEXT NOT NULL,
+    model TEXT NOT NULL,
+    scraped_at TEXT NOT NULL,
+    query TEXT,
+    title TEXT,
+    price REAL,
+    price_valid_till TEXT,
+    PRIMARY KEY (retailer, model, scraped_at)
+);
+CREATE INDEX IF NOT EXISTS idx_prices_model_time ON prices (model, scraped_at);
+CREATE INDEX IF NOT EXISTS idx_prices_retailer_time ON prices (retailer, scraped_at);
+"""
+
+UPSERT = """
+INSERT INTO prices (retailer, model, scraped_at, query, title, price, price_valid_till)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (retailer, model, scraped_at) DO UPDATE SET
+    query = excluded.query,
+    title = excluded.title,
+    price = excluded.price,
+    price_valid_till = excluded.price_valid_till
+"""
+
+
+def _price_value(price) -> Optional[float]:
+    if price is None or price == "":
+        return None
+    if isinstance(price, (int, float)):
+        return float(price)
+    return clean_price(str(price))
+
+
+class PriceHistoryStore:
+    """SQLite price history, keyed on retailer, normalized model number and scrape time.
+
+    Used as a result sink: ``write`` buffers rows and upserts them in one
+    transaction every ``batch_size`` records, and ``close`` writes the rest.
+    """
+
+    def __init__(self, path: str, batch_size: int = 50):
+        self.path = path
+        self.batch_size = batch_size
+        self.rows_written = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Shard processes may share one database; wait on their write locks
+        self._conn = sqlite3.connect(path, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._pending: List[tuple] = []
+
+    def write(self, record: Dict):
+        """Buffer one streamed (product, retailer) record; untitled and unchanged results are skipped"""
+        result = record.get("Result") or {}
+        # Unchanged results carry last run's price, which is already recorded
+        if not result.get("Title") or result.get("Status") == "unchanged":
+            return
+        self._pending.append((
+            record["Retailer"],
+            record["Model"],
+            record["ScrapedAt"],
+            record.get("Query"),
+            result["Title"],
+            _price_value(result.get("Price")),
+            result.get("PriceValidTill") or None,
+        ))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        with self._conn:
+            self._conn.executemany(UPSERT, self._pending)
+        self.rows_written += len(self._pending)
+        self._pending = []
+
+    def history(self, model: str, retailer: Optional[str] = None, since: Optional[str] = None,
+                until: Optional[str] = None) -> List[Dict]:
+        """Price points for a normalized model number, oldest first, optionally for one retailer and time range"""
+        self.flush()
+        clauses = ["model = ?"]
+        params: List = [model]
+        if retailer:
+            clauses.append("retailer = ?")
+            params.append(retailer.lower())
+        if since:
+            clauses.append("scraped_at >= ?")
+            params.append(since)
+        if until:
+            clauses.append("scraped_at < ?")
+            params.append(until)
+        rows = self._conn.execute(
+            "SELECT retailer, scraped_at, title, price, price_valid_till FROM prices "
+            f"WHERE {' AND '.join(clauses)} ORDER BY scraped_at, retailer",
+            params,
+        )
+        return [
+            {"Retailer": retailer, "ScrapedAt": scraped_at, "Title": title, "Price": price, "PriceValidTill": valid_till}
+            for retailer, scraped_at, title, price, valid_till in rows
+        ]
+
+    def close(self):
+        if self._conn is None:
+            return
+        self.flush()
+        self._conn.close()
+        self._conn = None
@@ -0,0 +1,68 @@
+import json
+import os
+import time
+from typing import Dict, Iterator, List, Optional
+
+from .results import merge_indexed_results
+
+
+class NdjsonSink:
+    """Append-only NDJSON stream of search results, one line per (product, retailer) search.
+
+    Lines are flushed every ``flush_every`` records or ``flush_interval``
+    seconds, whichever comes first, so a crashed run keeps everything that
+    was scraped up to the last flush.
+    """
+
+    def __init__(self, path: str, flush_every: int = 20, flush_interval: float = 5.0):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.records_written = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'a', encoding='utf-8')
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+    def write(self, record: Dict):
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.records_written += 1
+        self._unflushed += 1
+        if self._unflushed >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        self._file.flush()
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+def read_ndjson(path: str) -> Iterator[Dict]:
+    """Read records back, skipping a truncated last line left by a crash"""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                print(f"Skipping malformed line in {path}")
+
+
+def finalize_ndjson(path: str, retailer_order: List[str], known_brands: Optional[List[str]] = None) -> List[Dict]:
+    """Build the brand-grouped results from a stream written by NdjsonSink"""
+    indexed_results = []
+    for record in read_ndjson(path):
+        result = record.get("Result") or {}
+        # Only titled results make it into the brand-grouped output, as in a normal run
+        products = [result] if result.get('Title') else []
+        indexed_results.append((record["Index"], {"Brand": record.get("QueryBrand"), "Product": products}))
+    return merge_indexed_results(indexed_results, retailer_order, known_brands)
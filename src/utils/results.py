@@ -0,0 +1,82 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# List of known brands for verification
+KNOWN_BRANDS = ['Samsung', 'LG', 'Hisense', 'SONY', 'TCL', 'Philips']
+
+def extract_brand_from_title(title: str, known_brands: Optional[List[str]] = None) -> str:
+    """Extract the actual brand from a product title"""
+    if not title:
+        return "Unknown"
+        
+    title_lower = title.lower()
+    for brand in known_brands or KNOWN_BRANDS:
+        if brand.lower() in title_lower:
+            return brand
+    return "Unknown"
+
+def merge_by_brand(all_results: List[Dict], known_brands: Optional[List[str]] = None) -> List[Dict]:
+    """Merge per-product results ({"Brand", "Product": [...]}) into brand groups"""
+    # Merge results by brand
+    brand_results = defaultdict(list)
+    for result in all_results:
+        if not result:
+            continue
+        query_brand = result.get("Brand")
+        
+        for product in result.get("Product", []):
+            product_title = product.get('Title', '')
+            website = product.get('Website', '')
+            
+            # Special case: Force Samsung scraper results to be Samsung brand
+            if website == 'Samsung':
+                print(f"Assigning Samsung scraped product to Samsung brand: '{product_title[:30]}...'")
+                brand_results['Samsung'].append(product)
+                continue
+                
+            # For other scrapers, verify the brand in the title
+            actual_brand = extract_brand_from_title(product_title, known_brands)
+            
+            # Only add product if its title contains a brand
+            if actual_brand != "Unknown":
+                # Add to the correct brand category
+                print(f"Assigning product '{product_title[:30]}...' to brand {actual_brand}")
+                brand_results[actual_brand].append(product)
+                
+            elif query_brand and query_brand != "Unknown":
+                # If we can't detect a brand but have the query brand, use that
+                print(f"Using query brand {query_brand} for '{product_title[:30]}...'")
+                brand_results[query_brand].append(product)
+    
+    # Convert to final format
+    final_results = []
+    for brand, products in brand_results.items():
+        if products:  # Only include brands with products
+            final_results.append({
+                "Brand": brand,
+                "Products": products
+            })
+    
+    return final_results
+
+def merge_indexed_results(indexed_results: Iterable[Tuple[int, Dict]], retailer_order: List[str],
+                          known_brands: Optional[List[str]] = None) -> List[Dict]:
+    """Merge per-product results that arrive in pieces and out of order.
+
+    ``indexed_results`` holds (input index, {"Brand", "Product": [...]})
+    pairs; pieces with the same index are combined, put back in input order
+    with each product's results in ``retailer_order`` (retailer keys like
+    'bestbuy'), and then grouped by brand like a single in-process run.
+    """
+    by_index: Dict[int, Dict] = {}
+    for index, result in indexed_results:
+        merged = by_index.setdefault(index, {"Brand": result.get("Brand"), "Product": []})
+        merged["Product"].extend(result.get("Product", []))
+
+    order = {retailer: position for position, retailer in enumerate(retailer_order)}
+    all_results = []
+    for index in sorted(by_index):
+        result = by_index[index]
+        result["Product"].sort(key=lambda product: order.get(product.get('Website', '').lower(), len(order)))
+        all_results.append(result)
+    return merge_by_brand(all_results, known_brands)
@@ -0,0 +1,127 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, List
+
+
+def to_cdp_cookie(cookie: Dict) -> Dict:
+    """Convert a WebDriver cookie to the shape DevTools' Network.setCookies expects"""
+    cdp_cookie = {key: cookie[key] for key in ('name', 'value', 'domain', 'path', 'secure', 'httpOnly') if key in cookie}
+    if 'expiry' in cookie:
+        cdp_cookie['expires'] = cookie['expiry']
+    return cdp_cookie
+
+
+class SessionStore:
+    """One retailer's cookie jar, shared by its drivers and HTTP session and kept between runs.
+
+    Cookies are saved in WebDriver's format. The session is rotated (cookies
+    dropped, ``version`` bumped so drivers and the HTTP client reset) when it
+    gets too old, has served too many pages, or the retailer challenges it
+    ``max_challenges`` times.
+    """
+
+    def __init__(self, name: str, path: str, max_age: float = 0, max_pages: int = 0, max_challenges: int = 1,
+                 save_every: int = 20):
+        self.name = name
+        self.path = path
+        self.max_age = max_age
+        self.max_pages = max_pages
+        self.max_challenges = max_challenges
+        self.save_every = save_every
+        self.version = 0
+        self._lock = threading.Lock()
+        self._cookies: Dict[tuple, Dict] = {}
+        self._created_at = time.time()
+        self._pages = 0
+        self._challenges = 0
+        self._unsaved = 0
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self._created_at = data.get('created_at', self._created_at)
+        self._pages = data.get('pages', 0)
+        if self._expired():
+            print(f"[{self.name}] Saved session expired, starting a new one")
+            self._created_at, self._pages = time.time(), 0
+            return
+        for cookie in data.get('cookies', []):
+            self._cookies[self._key(cookie)] = cookie
+
+    @staticmethod
+    def _key(cookie: Dict) -> tuple:
+        return cookie.get('name'), cookie.get('domain'), cookie.get('path', '/')
+
+    def _expired(self) -> bool:
+        if self.max_age and time.time() - self._created_at > self.max_age:
+            return True
+        return bool(self.max_pages and self._pages >= self.max_pages)
+
+    def cookies(self) -> List[Dict]:
+        with self._lock:
+            now = time.time()
+            return [cookie for cookie in self._cookies.values() if cookie.get('expiry', now + 1) > now]
+
+    def update(self, cookies: List[Dict]):
+        """Merge cookies read back from a driver or the HTTP client"""
+        with self._lock:
+            for cookie in cookies:
+                if cookie.get('name'):
+                    self._cookies[self._key(cookie)] = cookie
+            self._unsaved += 1
+            due = self._unsaved >= self.save_every
+        if due:
+            self.save()
+
+    def record_page(self):
+        """Count a healthy page served on this session, rotating it once it has served its quota"""
+        with self._lock:
+            self._pages += 1
+            expired = self._expired()
+        if expired:
+            self.rotate("session age/page limit")
+
+    def record_challenge(self, reason: str):
+        """The retailer challenged or throttled us; rotate once that happens often enough"""
+        with self._lock:
+            self._challenges += 1
+            rotate = self.max_challenges and self._challenges >= self.max_challenges
+        if rotate:
+            self.rotate(reason)
+
+    def rotate(self, reason: str):
+        """Drop the session's cookies so every driver and the HTTP client start fresh"""
+        with self._lock:
+            self._cookies = {}
+            self._created_at = time.time()
+            self._pages = 0
+            self._challenges = 0
+            self.version += 1
+        print(f"[{self.name}] Rotating session ({reason})")
+        self.save()
+
+    def save(self):
+        with self._lock:
+            data = {'created_at': self._created_at, 'pages': self._pages, 'cookies': list(self._cookies.values())}
+            self._unsaved = 0
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"[{self.name}] Could not save session: {str(e)}")
+
+
+def session_for(retailer_key: str, directory: str, policy: Dict) -> SessionStore:
+    """Build a retailer's session store from its rotation policy"""
+    return SessionStore(retailer_key, os.path.join(directory, f"{retailer_key}.json"), **policy)
@@ -0,0 +1,123 @@
+import json
+import re
+from typing import Any, Dict, Iterator, List, Optional
+
+from .helpers import clean_price
+
+# <script type="application/ld+json"> and <script type="application/json">
+# blocks, which covers __NEXT_DATA__ and most serialized search states
+JSON_SCRIPT_RE = re.compile(
+    r'<script[^>]*type=["\']application/(?:ld\+)?json["\'][^>]*>(.*?)</script>',
+    re.IGNORECASE | re.DOTALL,
+)
+
+# Server-side state assigned to a global, e.g. window.__INITIAL_STATE__ = {...};
+STATE_ASSIGNMENT_RE = re.compile(r'(?:window\.)?__(?:INITIAL|PRELOADED)_STATE__\s*=\s*')
+
+TITLE_KEYS = ('name', 'title', 'productName')
+PRICE_KEYS = ('price', 'salePrice', 'sale_price', 'currentPrice', 'regularPrice', 'priceValue', 'lowPrice')
+SKU_KEYS = ('sku', 'mpn', 'model', 'modelNumber', 'productId', 'objectID')
+NESTED_PRICE_KEYS = ('value', 'amount', 'default', 'current', 'price', 'lowPrice', 'CAD')
+
+
+def _coerce_price(value: Any, depth: int = 0) -> Optional[float]:
+    """Turn the many shapes retailers use for a price into a positive float"""
+    if depth > 3 or value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value) if value > 0 else None
+    if isinstance(value, str):
+        price = clean_price(value)
+        return price if price else None
+    if isinstance(value, dict):
+        for key in NESTED_PRICE_KEYS:
+            if key in value:
+                price = _coerce_price(value[key], depth + 1)
+                if price:
+                    return price
+        return None
+    if isinstance(value, list) and value:
+        return _coerce_price(value[0], depth + 1)
+    return None
+
+
+def _record_from(obj: Dict) -> Optional[Dict]:
+    """Build a title/price/SKU record from a product-like JSON object"""
+    title = next((obj[key].strip() for key in TITLE_KEYS if isinstance(obj.get(key), str) and obj[key].strip()), "")
+    if not title:
+        return None
+
+    price = None
+    for key in PRICE_KEYS:
+        if key in obj:
+            price = _coerce_price(obj[key])
+            if price:
+                break
+    if not price and 'offers' in obj:
+        offers = obj['offers']
+        if isinstance(offers, list):
+            offers = offers[0] if offers else {}
+        if isinstance(offers, dict):
+            price = _coerce_price(offers.get('price') or offers.get('lowPrice'))
+    if not price:
+        return None
+
+    sku = next((str(obj[key]) for key in SKU_KEYS if obj.get(key) not in (None, "")), "")
+    return {"title": title, "price": price, "sku": sku}
+
+
+def _walk(data: Any) -> Iterator[Dict]:
+    """Yield product records depth-first, in document order"""
+    stack = [data]
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, dict):
+            record = _record_from(obj)
+            if record:
+                yield record
+                continue
+            stack.extend(reversed(list(obj.values())))
+        elif isinstance(obj, list):
+            stack.extend(reversed(obj))
+
+
+def iter_json_blobs(page_content: str) -> Iterator[Any]:
+    """Yield every embedded JSON document found in the raw HTML"""
+    for match in JSON_SCRIPT_RE.finditer(page_content):
+        try:
+            yield json.loads(match.group(1).strip())
+        except ValueError:
+            continue
+
+    decoder = json.JSONDecoder()
+    for match in STATE_ASSIGNMENT_RE.finditer(page_content):
+        try:
+            data, _ = decoder.raw_decode(page_content, match.end())
+            yield data
+        except ValueError:
+            continue
+
+
+def extract_structured_records(page_content: str, limit: int = 20) -> List[Dict]:
+    """Extract product records from embedded JSON without building a DOM.
+
+    Looks at JSON-LD, ``__NEXT_DATA__``/application-json blobs (which is where
+    Algolia hit payloads are serialized) and ``__INITIAL_STATE__`` style
+    assignments. Returns at most ``limit`` de-duplicated records of the form
+    ``{"title": ..., "price": ..., "sku": ...}``.
+    """
+    if not page_content:
+        return []
+
+    records = []
+    seen = set()
+    for blob in iter_json_blobs(page_content):
+        for record in _walk(blob):
+            key = (record['title'], record['price'])
+            if key in seen:
+                continue
+            seen.add(key)
+            records.append(record)
+            if len(records) >= limit:
+                return records
+    return records
@@ -0,0 +1,194 @@
+import asyncio
+
+import pytest
+
+from scrapers import circuit_breaker, parse_pool
+from scrapers.amazon_scraper import AmazonScraper
+from scrapers.base_scraper import STATUS_NOT_CACHED
+from scrapers.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from scrapers.retry_policy import RetryPolicy
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(circuit_breaker.time, 'monotonic', clock)
+    return clock
+
+
+def make_breaker(**kwargs):
+    options = dict(failure_threshold=3, empty_threshold=5, cool_down=10, max_cool_down=40)
+    options.update(kwargs)
+    return CircuitBreaker('Test', **options)
+
+
+def trip(breaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = make_breaker()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.opened == 1
+
+
+def test_success_resets_the_counts(clock):
+    breaker = make_breaker()
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    assert breaker.failures == 1
+
+
+def test_opens_after_consecutive_empty_pages(clock):
+    breaker = make_breaker()
+    for _ in range(4):
+        breaker.record_empty()
+    assert breaker.state == CLOSED
+    breaker.record_empty()
+    assert breaker.state == OPEN
+    assert breaker.failures == 0
+
+
+def test_failures_count_as_empty_pages(clock):
+    breaker = make_breaker(failure_threshold=10)
+    for _ in range(3):
+        breaker.record_empty()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+
+def test_open_breaker_skips_searches(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    assert not breaker.allow()
+    assert not breaker.allow()
+    assert breaker.skipped == 2
+    assert breaker.health()['skipped'] == 2
+
+
+def test_half_open_lets_a_single_probe_through(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    clock.now += 10
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()
+    assert breaker.skipped == 1
+
+
+def test_successful_probe_closes(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    clock.now += 10
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow() and breaker.allow()
+
+
+def test_failed_probe_doubles_the_cool_down_up_to_the_cap(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    for expected in (20, 40, 40):
+        clock.now += breaker.cool_down
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert breaker.cool_down == expected
+    clock.now += 39
+    assert not breaker.allow()
+
+
+def test_empty_probe_reopens(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    clock.now += 10
+    assert breaker.allow()
+    breaker.record_empty()
+    assert breaker.state == OPEN
+    assert breaker.cool_down == 20
+
+
+def test_success_restores_the_base_cool_down(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    clock.now += 10
+    breaker.allow()
+    breaker.record_failure()
+    clock.now += 20
+    breaker.allow()
+    breaker.record_success()
+    trip(breaker)
+    assert breaker.cool_down == 10
+
+
+def test_released_probe_lets_the_next_search_probe(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    clock.now += 10
+    assert breaker.allow()
+    breaker.release_probe()
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+
+
+class ReplayCache:
+    """A page cache in replay mode holding only the given pages"""
+
+    replay = True
+
+    def __init__(self, pages):
+        self.pages = pages
+
+    def get(self, retailer, url):
+        return self.pages.get(url)
+
+
+def test_replay_cache_misses_do_not_trip_the_breaker(clock, monkeypatch):
+    monkeypatch.setattr(parse_pool, 'PARSE_WORKERS', 0)
+    scraper = AmazonScraper.for_parsing('Amazon', 'https://www.amazon.ca')
+    scraper.breaker = make_breaker()
+    scraper.retry_policy = RetryPolicy()
+    scraper.fingerprints = None
+    cached = {'name': 'LG 50" UHD 4K Smart LED TV - 50UT7570PUB'}
+    page = ('<div data-component-type="s-search-result"><h2><a class="a-link-normal">'
+            'LG 50" UHD 4K Smart LED TV 50UT7570PUB</a></h2>'
+            '<span class="a-price"><span class="a-offscreen">$499.99</span></span></div>')
+    scraper.page_cache = ReplayCache({scraper.build_search_url(cached): page})
+
+    async def run():
+        misses = [await scraper.search_product({'name': f"Sony TV KD{n}X77L"}) for n in range(10)]
+        return misses, await scraper.search_product(cached)
+
+    misses, hit = asyncio.run(run())
+    assert {miss['Status'] for miss in misses} == {STATUS_NOT_CACHED}
+    assert scraper.breaker.state == CLOSED
+    assert hit['Status'] == 'ok' and hit['Price'] == 499.99
+
+
+def test_replay_miss_releases_the_probe(clock):
+    scraper = AmazonScraper.for_parsing('Amazon', 'https://www.amazon.ca')
+    scraper.breaker = make_breaker()
+    trip(scraper.breaker)
+    clock.now += 10
+    assert scraper.breaker.allow()
+    scraper.record_outcome(STATUS_NOT_CACHED)
+    assert scraper.breaker.state == HALF_OPEN
+    assert scraper.breaker.allow()
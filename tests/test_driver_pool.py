@@ -0,0 +1,159 @@
+import asyncio
+import threading
+
+from scrapers.driver_pool import DriverPool
+
+
+class FakeDriver:
+    def __init__(self, number):
+        self.number = number
+        self.alive = True
+        self.quit_called = False
+
+    @property
+    def current_url(self):
+        if not self.alive:
+            raise Exception("invalid session id")
+        return "about:blank"
+
+    def quit(self):
+        self.quit_called = True
+
+
+class Factory:
+    def __init__(self):
+        self.drivers = []
+
+    def __call__(self):
+        driver = FakeDriver(len(self.drivers))
+        self.drivers.append(driver)
+        return driver
+
+
+def make_pool(**kwargs):
+    factory = Factory()
+    options = dict(min_size=1, max_size=2, max_pages=3)
+    options.update(kwargs)
+    return DriverPool('Test', factory, **options), factory
+
+
+def test_drivers_are_created_lazily_and_reused():
+    async def run():
+        pool, factory = make_pool()
+        first = await pool.checkout()
+        await pool.checkin(first)
+        second = await pool.checkout()
+        return first, second, factory
+
+    first, second, factory = asyncio.run(run())
+    assert second is first
+    assert len(factory.drivers) == 1
+
+
+def test_checkout_waits_for_a_driver_once_the_pool_is_full():
+    async def run():
+        pool, factory = make_pool()
+        held = [await pool.checkout(), await pool.checkout()]
+        waiting = asyncio.ensure_future(pool.checkout())
+        await asyncio.sleep(0.05)
+        blocked = not waiting.done()
+        await pool.checkin(held[0])
+        handed = await asyncio.wait_for(waiting, 1)
+        return blocked, handed, held, factory, pool
+
+    blocked, handed, held, factory, pool = asyncio.run(run())
+    assert blocked
+    assert handed is held[0]
+    assert len(factory.drivers) == 2 and pool.size == 2
+
+
+def test_worn_out_drivers_are_recycled():
+    async def run():
+        pool, factory = make_pool(max_pages=2)
+        first = await pool.checkout()
+        await pool.checkin(first)
+        await pool.checkout()
+        await pool.checkin(first)
+        replacement = await pool.checkout()
+        return first, replacement, pool
+
+    first, replacement, pool = asyncio.run(run())
+    assert first.driver.quit_called
+    assert replacement is not first
+    assert pool.size == 1
+
+
+def test_unhealthy_idle_drivers_are_replaced():
+    async def run():
+        pool, factory = make_pool()
+        first = await pool.checkout()
+        await pool.checkin(first)
+        first.driver.alive = False
+        second = await pool.checkout()
+        return first, second, pool
+
+    first, second, pool = asyncio.run(run())
+    assert first.driver.quit_called
+    assert second is not first and second.driver.alive
+    assert pool.size == 1
+
+
+def test_discarded_drivers_free_their_slot():
+    async def run():
+        pool, factory = make_pool(max_size=1)
+        crashed = await pool.checkout()
+        await pool.checkin(crashed, discard=True)
+        return crashed, await asyncio.wait_for(pool.checkout(), 1)
+
+    crashed, replacement = asyncio.run(run())
+    assert crashed.driver.quit_called
+    assert replacement is not crashed
+
+
+def test_warm_up_starts_the_minimum():
+    async def run():
+        pool, factory = make_pool(min_size=2, max_size=3)
+        await pool.warm_up()
+        return pool, factory
+
+    pool, factory = asyncio.run(run())
+    assert len(factory.drivers) == 2
+    assert pool.size == 2 and pool.in_use == 0
+
+
+def test_aborted_slot_is_freed_only_after_the_driver_quits():
+    release = threading.Event()
+
+    async def run():
+        pool, factory = make_pool(max_size=1)
+        pooled = await pool.checkout()
+        pooled.driver.quit = lambda: release.wait(5)
+        await pool.abort(pooled)
+        waiting = asyncio.ensure_future(pool.checkout())
+        await asyncio.sleep(0.05)
+        blocked = not waiting.done()
+        release.set()
+        replacement = await asyncio.wait_for(waiting, 1)
+        await pool.close()
+        return blocked, pooled, replacement
+
+    blocked, pooled, replacement = asyncio.run(run())
+    assert blocked
+    assert replacement is not pooled
+
+
+def test_close_quits_idle_drivers_and_refuses_checkouts():
+    async def run():
+        pool, factory = make_pool()
+        pooled = await pool.checkout()
+        await pool.checkin(pooled)
+        await pool.close()
+        try:
+            await pool.checkout()
+        except Exception as e:
+            return pooled, str(e)
+        return pooled, None
+
+    pooled, error = asyncio.run(run())
+    assert pooled.driver.quit_called
+    assert error and 'closed' in error
@@ -0,0 +1,66 @@
+import json
+
+from utils.result_sink import NdjsonSink, finalize_ndjson, read_ndjson
+
+RETAILERS = ['amazon', 'bestbuy', 'costco']
+
+
+def record(index, brand, website, title, price=499.99):
+    return {
+        "Index": index,
+        "Query": f"{brand} TV {index}",
+        "QueryBrand": brand,
+        "Retailer": website.lower(),
+        "Result": {"Website": website, "Title": title, "Price": price, "Status": "ok" if title else "no_results"},
+    }
+
+
+def write_stream(path, records):
+    sink = NdjsonSink(str(path), flush_every=100)
+    for item in records:
+        sink.write(item)
+    sink.close()
+
+
+def test_finalize_groups_by_brand_in_input_and_retailer_order(tmp_path):
+    path = tmp_path / 'results.ndjson'
+    write_stream(path, [
+        record(1, 'Samsung', 'Costco', 'Samsung 65" QLED QN65Q60DAFXZC'),
+        record(0, 'LG', 'BestBuy', 'LG 50" UHD TV 50UT7570PUB'),
+        record(1, 'Samsung', 'Amazon', 'Samsung 65" QLED TV QN65Q60DAFXZC'),
+        record(0, 'LG', 'Amazon', 'LG 50" 4K TV 50UT7570PUB'),
+        record(0, 'LG', 'Costco', ''),
+    ])
+
+    results = finalize_ndjson(str(path), RETAILERS)
+
+    assert [group['Brand'] for group in results] == ['LG', 'Samsung']
+    assert [product['Website'] for product in results[0]['Products']] == ['Amazon', 'BestBuy']
+    assert [product['Website'] for product in results[1]['Products']] == ['Amazon', 'Costco']
+
+
+def test_untitled_results_are_left_out(tmp_path):
+    path = tmp_path / 'results.ndjson'
+    write_stream(path, [record(0, 'LG', 'Amazon', ''), record(0, 'LG', 'BestBuy', '')])
+    assert finalize_ndjson(str(path), RETAILERS) == []
+
+
+def test_a_truncated_last_line_is_skipped(tmp_path):
+    path = tmp_path / 'results.ndjson'
+    write_stream(path, [record(0, 'LG', 'Amazon', 'LG 50" 4K TV 50UT7570PUB')])
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record(1, 'LG', 'BestBuy', 'LG 65" TV'))[:40])
+
+    assert len(list(read_ndjson(str(path)))) == 1
+    results = finalize_ndjson(str(path), RETAILERS)
+    assert [product['Website'] for group in results for product in group['Products']] == ['Amazon']
+
+
+def test_sink_flushes_every_few_records(tmp_path):
+    path = tmp_path / 'results.ndjson'
+    sink = NdjsonSink(str(path), flush_every=2, flush_interval=3600)
+    sink.write(record(0, 'LG', 'Amazon', 'LG TV'))
+    assert list(read_ndjson(str(path))) == []
+    sink.write(record(0, 'LG', 'BestBuy', 'LG TV'))
+    assert len(list(read_ndjson(str(path)))) == 2
+    sink.close()
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+from selenium.common.exceptions import InvalidSessionIdException, NoSuchWindowException, TimeoutException
+
+from scrapers.retry_policy import (
+    FAILURE_BOT_WALL, FAILURE_DRIVER_CRASH, FAILURE_FETCH_ERROR, FAILURE_PARSE_MISS, FAILURE_TIMEOUT,
+    RetryPolicy, SearchFailure, classify_exception,
+)
+
+
+@pytest.mark.parametrize('error, kind', [
+    (SearchFailure(FAILURE_BOT_WALL, "captcha"), FAILURE_BOT_WALL),
+    (SearchFailure(FAILURE_PARSE_MISS), FAILURE_PARSE_MISS),
+    (asyncio.TimeoutError(), FAILURE_TIMEOUT),
+    (TimeoutError(), FAILURE_TIMEOUT),
+    (TimeoutException("page load"), FAILURE_TIMEOUT),
+    (InvalidSessionIdException("gone"), FAILURE_DRIVER_CRASH),
+    (NoSuchWindowException("closed"), FAILURE_DRIVER_CRASH),
+    (ConnectionRefusedError(), FAILURE_DRIVER_CRASH),
+    (Exception("Message: chrome not reachable"), FAILURE_DRIVER_CRASH),
+    (Exception("Read timed out"), FAILURE_TIMEOUT),
+    (Exception("HTTP 503"), FAILURE_FETCH_ERROR),
+])
+def test_classify_exception(error, kind):
+    assert classify_exception(error) == kind
+
+
+def test_search_failure_message():
+    assert str(SearchFailure(FAILURE_BOT_WALL, "captcha page")) == "captcha page"
+    assert str(SearchFailure(FAILURE_BOT_WALL)) == FAILURE_BOT_WALL
+
+
+def test_should_retry_within_attempt_budget():
+    policy = RetryPolicy(max_attempts=3)
+    assert policy.should_retry(FAILURE_TIMEOUT, 1)
+    assert policy.should_retry(FAILURE_TIMEOUT, 2)
+    assert not policy.should_retry(FAILURE_TIMEOUT, 3)
+
+
+def test_should_retry_only_listed_kinds():
+    policy = RetryPolicy(max_attempts=3, retry_on=[FAILURE_TIMEOUT])
+    assert policy.should_retry(FAILURE_TIMEOUT, 1)
+    assert not policy.should_retry(FAILURE_BOT_WALL, 1)
+
+
+def test_single_attempt_never_retries():
+    policy = RetryPolicy(max_attempts=0)
+    assert policy.max_attempts == 1
+    assert not policy.should_retry(FAILURE_TIMEOUT, 1)
+
+
+@pytest.mark.parametrize('attempt', [1, 2, 3, 4, 8])
+def test_backoff_bounds(attempt):
+    policy = RetryPolicy(base_delay=1.0, max_delay=5.0)
+    cap = min(5.0, 2 ** (attempt - 1))
+    delays = [policy.backoff(attempt) for _ in range(200)]
+    assert all(0 <= delay <= cap for delay in delays)
+
+
+def test_backoff_is_jittered():
+    policy = RetryPolicy(base_delay=1.0, max_delay=20.0)
+    assert len({policy.backoff(3) for _ in range(20)}) > 1
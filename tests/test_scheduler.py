@@ -0,0 +1,122 @@
+import asyncio
+import time
+
+import main
+from main import PriceScraper
+from scheduler import CrawlScheduler
+
+
+class HangingScraper:
+    """Stands in for a retailer whose fetch never returns"""
+
+    website = 'Hanging'
+    retailer_key = 'hanging'
+    breaker = None
+
+    def __init__(self):
+        self.started = 0
+        self.cancelled = 0
+        self.closed = False
+
+    async def search_product(self, product, budget=None):
+        if budget is not None:
+            budget.start()
+        self.started += 1
+        try:
+            await asyncio.sleep(3600)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+
+    async def warm_up(self):
+        pass
+
+    async def close(self):
+        self.closed = True
+
+    def format_result(self, product, title, price, price_valid_till="", status=None):
+        return {"Website": self.website, "Title": title, "Price": price, "Status": status}
+
+
+class QuickScraper(HangingScraper):
+    website = 'Quick'
+    retailer_key = 'quick'
+
+    async def search_product(self, product, budget=None):
+        if budget is not None:
+            budget.start()
+        self.started += 1
+        return self.format_result(product, product['name'], 1.0, status='ok')
+
+
+def test_results_come_back_through_the_queue():
+    async def run():
+        scraper = QuickScraper()
+        scheduler = CrawlScheduler([scraper])
+        scheduler.start()
+        results = await asyncio.gather(*(scheduler.submit(scraper, {'name': f"TV {i}"}) for i in range(5)))
+        await scheduler.close()
+        return results
+
+    results = asyncio.run(run())
+    assert [result['Title'] for result in results] == [f"TV {i}" for i in range(5)]
+
+
+def test_cancelling_a_job_cancels_its_search():
+    async def run():
+        scraper = HangingScraper()
+        scheduler = CrawlScheduler([scraper])
+        scheduler.start()
+        future = scheduler.submit(scraper, {'name': 'TV'})
+        await asyncio.sleep(0.05)
+        future.cancel()
+        await asyncio.sleep(0.05)
+        await asyncio.wait_for(scheduler.close(), 2)
+        return scraper
+
+    scraper = asyncio.run(run())
+    assert scraper.started == 1 and scraper.cancelled == 1
+
+
+def test_close_right_after_a_job_is_cancelled_does_not_hang():
+    async def run():
+        scraper = HangingScraper()
+        scheduler = CrawlScheduler([scraper])
+        scheduler.start()
+        future = scheduler.submit(scraper, {'name': 'TV'})
+        await asyncio.sleep(0.05)
+        # The run deadline gives up on the job, then the scheduler is stopped straight away
+        future.cancel()
+        await asyncio.wait_for(scheduler.close(), 2)
+
+    asyncio.run(run())
+
+
+def test_run_deadline_times_out_hanging_searches_and_finishes():
+    async def run():
+        scraper = PriceScraper(retailers=[], run_timeout=0.3)
+        hanging, quick = HangingScraper(), QuickScraper()
+        scraper.scrapers = [quick, hanging]
+        results = await asyncio.wait_for(scraper.scrape_all([{'name': 'LG TV 50UT7570PUB'}]), 5)
+        return results, hanging
+
+    results, hanging = asyncio.run(run())
+    assert [product['Title'] for product in results[0]['Product']] == ['LG TV 50UT7570PUB']
+    assert hanging.cancelled == 1 and hanging.closed
+
+
+def test_product_budget_times_out_the_slow_retailers(monkeypatch):
+    monkeypatch.setattr(main, 'PRODUCT_TIMEOUT', 0.3)
+
+    async def run():
+        scraper = PriceScraper(retailers=[], run_timeout=0)
+        hanging, quick = HangingScraper(), QuickScraper()
+        scraper.scrapers = [quick, hanging]
+        started = time.monotonic()
+        results = await asyncio.wait_for(scraper.scrape_all([{'name': 'LG TV 50UT7570PUB'}]), 5)
+        return results, hanging, time.monotonic() - started
+
+    results, hanging, elapsed = asyncio.run(run())
+    assert [product['Title'] for product in results[0]['Product']] == ['LG TV 50UT7570PUB']
+    assert hanging.cancelled == 1
+    assert elapsed < 2
@@ -0,0 +1,56 @@
+import pytest
+
+from scrapers.amazon_scraper import AmazonScraper
+
+QUERY = {'name': 'LG 50" UHD 4K Smart LED TV - 50UT7570PUB'}
+
+
+@pytest.fixture
+def scraper():
+    return AmazonScraper.for_parsing('Amazon', 'https://www.amazon.ca')
+
+
+def test_model_number_match_wins_over_a_closer_title(scraper):
+    candidates = [
+        ('LG 50" UHD 4K Smart LED TV', 399.99),
+        ('LG 50 inch 4K TV (50-UT7570-PUB)', 449.99),
+    ]
+    assert scraper.select_match(QUERY, iter(candidates)) == candidates[1]
+
+
+def test_closest_title_without_a_model_number_match(scraper):
+    candidates = [
+        ('Wall mount for 40-70" TVs', 39.99),
+        ('LG 50" UHD 4K Smart LED TV (2024)', 399.99),
+        ('HDMI cable 2m', 9.99),
+    ]
+    assert scraper.select_match(QUERY, iter(candidates)) == candidates[1]
+
+
+def test_nothing_close_enough(scraper):
+    candidates = [('HDMI cable 2m', 9.99), ('Soundbar remote', 19.99)]
+    assert scraper.select_match(QUERY, iter(candidates)) is None
+
+
+def test_no_candidates(scraper):
+    assert scraper.select_match(QUERY, iter([])) is None
+
+
+def test_only_the_top_candidates_are_considered(scraper):
+    scraper.max_candidates = 2
+    candidates = [('HDMI cable 2m', 9.99), ('Soundbar remote', 19.99),
+                  ('LG 50" UHD 4K Smart LED TV 50UT7570PUB', 399.99)]
+    assert scraper.select_match(QUERY, iter(candidates)) is None
+
+
+def test_candidates_after_a_model_match_are_not_read(scraper):
+    def candidates():
+        yield 'LG 50UT7570PUB', 399.99
+        raise AssertionError("read past the model number match")
+
+    assert scraper.select_match(QUERY, candidates()) == ('LG 50UT7570PUB', 399.99)
+
+
+def test_query_without_a_model_number_uses_similarity(scraper):
+    candidates = [('Sony Bravia 65 inch TV', 1299.99), ('Samsung Frame 65 inch TV', 1499.99)]
+    assert scraper.select_match({'name': 'Samsung Frame 65 inch TV'}, iter(candidates)) == candidates[1]
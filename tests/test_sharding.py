@@ -0,0 +1,51 @@
+import zlib
+
+import pytest
+
+from sharding import partition_products, partition_retailers, shard_for_product
+
+PRODUCTS = [
+    {'name': 'Hisense 50" 4K Smart Google AI Upscaler LED TV - 50A68N'},
+    {'name': 'Samsung 75" 4K Tizen Smart CUHD TV - UN75DU7100FXZC'},
+    {'name': 'LG 50" UHD 4K Smart LED TV - 50UT7570PUB'},
+    {'name': 'Samsung 65" Neo QLED 4K Tizen Smart TV QN85D - QN65QN85DBFXZC'},
+    {'name': 'Hisense 50" 4K Smart Google AI Upscaler LED TV - 50A68N'},
+]
+
+
+def test_shard_is_crc32_of_the_model_number():
+    assert shard_for_product(PRODUCTS[2], 4) == zlib.crc32(b'50UT7570PUB') % 4
+    assert shard_for_product(PRODUCTS[3], 7) == zlib.crc32(b'QN65QN85DBFXZC') % 7
+
+
+def test_same_model_lands_on_the_same_shard():
+    spelled_differently = {'name': 'HISENSE 50 inch TV 50a68n'}
+    for shard_count in range(1, 9):
+        assert shard_for_product(PRODUCTS[0], shard_count) == shard_for_product(spelled_differently, shard_count)
+
+
+def test_partition_products_keeps_input_indices():
+    shards = partition_products(PRODUCTS, 3)
+    assert len(shards) == 3
+    indexed = sorted(pair for shard in shards for pair in shard)
+    assert indexed == list(enumerate(PRODUCTS))
+    for shard_index, shard in enumerate(shards):
+        assert all(shard_for_product(product, 3) == shard_index for _, product in shard)
+
+
+def test_partition_products_groups_duplicates():
+    shards = partition_products(PRODUCTS, 4)
+    holding = [shard_index for shard_index, shard in enumerate(shards)
+               for index, _ in shard if index in (0, 4)]
+    assert len(set(holding)) == 1
+
+
+def test_partition_retailers_round_robin():
+    retailers = ['costco', 'staples', 'bestbuy', 'amazon', 'visions']
+    assert partition_retailers(retailers, 2) == [['costco', 'bestbuy', 'visions'], ['staples', 'amazon']]
+    assert partition_retailers(retailers, 5) == [[retailer] for retailer in retailers]
+
+
+def test_partition_retailers_rejects_more_shards_than_retailers():
+    with pytest.raises(ValueError):
+        partition_retailers(['costco', 'staples'], 3)